@@ -1,37 +1,114 @@
-from flask import Flask, send_from_directory, render_template
-from config import Config
-from extensions import db, migrate, session, csrf
-from routes.auth import auth_bp, create_admin_command
-from routes.admin import admin_bp
-from routes.student import student_bp
-from routes.api import api_bp
-from routes.uploads import uploads_bp
+from __future__ import annotations
 import os
+import re
+import sys
+from pathlib import Path
+from flask import Flask, abort, current_app, render_template, request
+from config import Config
+from extensions import db, get_csrf, get_migrate, get_session
+
+# `flask` sub-commands that never serve HTTP requests
+CLI_ONLY_COMMANDS = {"db", "create-admin"}
+
+
+def _cli_command() -> str | None:
+    """Name of the `flask` sub-command being run, or None outside the flask CLI."""
+    prog = Path(sys.argv[0])
+    if prog.stem != "flask" and prog.parent.name != "flask":  # `flask ...` / `python -m flask ...`
+        return None
+    args = iter(sys.argv[1:])
+    for arg in args:
+        if arg in ("-A", "--app", "-e", "--env-file"):
+            next(args, None)  # skip the option's value
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+
+# multipart/form-data with a short, well-formed boundary (RFC 2046 bchars; the
+# RFC caps it at 70, but some clients -- Werkzeug's own test client included --
+# go a little over, so allow 128) and at most a few other short params; anything
+# else is refused before Werkzeug parses the header or the body.
+_MULTIPART_CT = re.compile(
+    r"multipart/form-data"
+    r"(?:\s*;\s*(?:boundary=(?:\"[0-9A-Za-z'()+_,./:=? -]{1,128}\"|[0-9A-Za-z'()+_,./:=?-]{1,128})"
+    r"|[A-Za-z-]{1,20}=[\w-]{1,40})){1,3}\s*",
+    re.IGNORECASE,
+)
+
+
+def reject_malformed_multipart():
+    """before_request guard: 400 for multipart bodies with a suspicious Content-Type."""
+    content_type = request.headers.get("Content-Type", "")
+    if content_type[:19].lower() != "multipart/form-data":
+        return None
+    if not _MULTIPART_CT.fullmatch(content_type) or "boundary=" not in content_type.lower():
+        abort(400)
+    return None
+
+
+def page_not_found(e):
+    """Custom 404 page. The compiled template is looked up once per app (unless auto-reloading)."""
+    template = current_app.extensions.get("not_found_template")
+    if template is None:
+        template = current_app.jinja_env.get_template("errors/404.html")
+        if not current_app.jinja_env.auto_reload:
+            current_app.extensions["not_found_template"] = template
+    # Still rendered per request: base.html shows this request's flashed messages
+    return render_template(template), 404
+
+
+def create_app(init_web: bool | None = None):
+    """
+    Build the Flask app.
+    init_web controls the HTTP-only extensions (sessions, CSRF); by default they
+    are skipped for CLI_ONLY_COMMANDS and enabled everywhere else.
+    """
+    command = _cli_command()
+    if init_web is None:
+        init_web = command not in CLI_ONLY_COMMANDS
 
-def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    Config.ensure_dirs()
 
     db.init_app(app)
-    migrate.init_app(app, db)
-    session.init_app(app)
-    csrf.init_app(app)
+    # Alembic is only needed by `flask db ...`; set FLASK_RUNNING_MIGRATIONS=1 to
+    # force it on when migrations are driven some other way.
+    if command == "db" or os.getenv("FLASK_RUNNING_MIGRATIONS") == "1":
+        get_migrate().init_app(app, db)
+
+    if init_web:
+        # Registered ahead of CSRFProtect, whose own before_request reads request.form
+        app.before_request(reject_malformed_multipart)
+        # Server-side sessions only when asked for; "cookie" keeps Flask's default
+        # signed-cookie sessions (no per-request session I/O at all).
+        session_type = app.config["SESSION_TYPE"]
+        if session_type != "cookie":
+            if session_type == "redis" and not app.config.get("SESSION_REDIS"):
+                import redis
+                app.config["SESSION_REDIS"] = redis.Redis.from_url(app.config["REDIS_URL"])
+            get_session().init_app(app)
+        get_csrf().init_app(app)
 
-    # 🔴 IMPORTANT: import models so Alembic “sees” them
-    with app.app_context():
-        import models  # noqa: F401  (ensure Subject, Question, Test, TestQuestion, TestResponse get registered)
+    # Blueprints (and the views/forms/queries behind them) are imported here rather
+    # than at module level, so importing `app` stays cheap until an app is built.
+    # They import `models`, which is what registers the tables on db.metadata
+    # for Alembic -- no separate `import models` needed.
+    from routes.auth import auth_bp, create_admin_command
+    from routes.admin import admin_bp
+    from routes.student import student_bp
+    from routes.api import api_bp
+    from routes.uploads import uploads_bp
 
-    app.register_blueprint(auth_bp)
+    app.register_blueprint(auth_bp, prepare_dummy_hash=init_web)
     app.register_blueprint(admin_bp, url_prefix="/admin")
     app.register_blueprint(student_bp)
     app.register_blueprint(api_bp, url_prefix="/api")
     app.register_blueprint(uploads_bp)
 
     # 🔹 Custom 404 handler
-    @app.errorhandler(404)
-    def page_not_found(e):
-        return render_template("errors/404.html"), 404
-
+    app.register_error_handler(404, page_not_found)
 
     app.cli.add_command(create_admin_command)
 
@@ -0,0 +1,89 @@
+# caches.py
+"""
+Process-local caches for small, near-static reference data.
+"""
+from __future__ import annotations
+import time
+from collections import namedtuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models import Subject
+
+# Plain (id, name) rows: safe to keep across requests/sessions, and templates
+# can still use `s.id` / `s.name` exactly as with Subject objects.
+SubjectRow = namedtuple("SubjectRow", ["id", "name"])
+
+
+class SubjectCache:
+    """
+    Snapshot of the subjects table ordered by name, kept per app.
+    Dropped as soon as this process commits an insert/update/delete of a Subject, and
+    re-read after SUBJECT_CACHE_TTL seconds so edits made by other worker
+    processes show up too.
+    """
+
+    key = "subject_cache"
+
+    def invalidate(self):
+        if has_app_context():
+            current_app.extensions.pop(self.key, None)
+
+    def _get_snapshot(self):
+        snap = current_app.extensions.get(self.key)  # (rows, by_id, loaded_at)
+        ttl = current_app.config.get("SUBJECT_CACHE_TTL", 60)
+        if snap is None or time.monotonic() - snap[2] > ttl:
+            rows = [
+                SubjectRow(sid, name)
+                for sid, name in db.session.query(Subject.id, Subject.name).order_by(Subject.name.asc())
+            ]
+            snap = (rows, {r.id: r for r in rows}, time.monotonic())
+            current_app.extensions[self.key] = snap
+        return snap
+
+    def all(self) -> list[SubjectRow]:
+        """All subjects, ordered by name."""
+        return self._get_snapshot()[0]
+
+    def choices(self) -> list[tuple[int, str]]:
+        """
+        (id, name) pairs for a SelectField, ordered by name. SubjectRow is already
+        such a pair, so this is the cached list itself: don't mutate it.
+        """
+        return self._get_snapshot()[0]
+
+    def get(self, subject_id: int) -> SubjectRow | None:
+        return self._get_snapshot()[1].get(subject_id)
+
+    def names(self) -> dict[int, str]:
+        """Map of subject id -> name."""
+        return {sid: row.name for sid, row in self._get_snapshot()[1].items()}
+
+
+subject_cache = SubjectCache()
+
+
+# Subject writes are noted at flush and only drop the cache once committed: a
+# request reloading it between flush and commit would otherwise cache rows that
+# may still roll back.
+_SUBJECTS_DIRTY = "subjects_dirty"
+
+
+@event.listens_for(Session, "before_flush")
+def _note_subject_writes(session, flush_context, instances):
+    if any(isinstance(obj, Subject) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info[_SUBJECTS_DIRTY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_subject_cache(session):
+    if session.info.pop(_SUBJECTS_DIRTY, False):
+        subject_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_subject_writes(session):
+    session.info.pop(_SUBJECTS_DIRTY, None)
@@ -1,9 +1,40 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from flask_session import Session
-from flask_wtf.csrf import CSRFProtect
 
 db = SQLAlchemy()
-migrate = Migrate()
-session = Session()
-csrf = CSRFProtect() 
\ No newline at end of file
+
+# Web-only extensions are created on first use, so CLI runs that never
+# serve HTTP (flask db ..., flask create-admin) don't import them at all.
+# Likewise Flask-Migrate (and Alembic behind it) is only loaded for `flask db`.
+_session = None
+_csrf = None
+_migrate = None
+
+
+def get_migrate():
+    """Return the Flask-Migrate extension, importing it (and Alembic) on first use."""
+    global _migrate
+    if _migrate is None:
+        from flask_migrate import Migrate
+        _migrate = Migrate()
+    return _migrate
+
+
+def get_session():
+    """
+    Return the Flask-Session extension, importing it on first use.
+    Only needed for server-side session backends (SESSION_TYPE != "cookie").
+    """
+    global _session
+    if _session is None:
+        from flask_session import Session
+        _session = Session()
+    return _session
+
+
+def get_csrf():
+    """Return the CSRFProtect extension, importing it on first use."""
+    global _csrf
+    if _csrf is None:
+        from flask_wtf.csrf import CSRFProtect
+        _csrf = CSRFProtect()
+    return _csrf
@@ -1,8 +1,14 @@
 # models.py
 from datetime import datetime
-import enum, os, shutil
+import enum, os, shutil, time, uuid
 from pathlib import Path
-from sqlalchemy import Index, UniqueConstraint, CheckConstraint, text, func, event
+from sqlalchemy import Index, UniqueConstraint, CheckConstraint, Computed, FetchedValue, text, func, event
+from sqlalchemy.dialects import mysql
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.orm import deferred, validates
 from extensions import db
 from flask import current_app
 
@@ -32,6 +38,84 @@ class TestStatusEnum(enum.Enum):
     discarded = "discarded"
 
 
+class BulkJobStatusEnum(enum.Enum):
+    queued = "queued"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+
+# ---------- Helpers ----------
+
+def new_test_uid() -> bytes:
+    """
+    Generate a UUIDv7 (RFC 9562) as 16 raw bytes for Test.test_uid.
+    The leading 48 bits are a millisecond timestamp, so new tests land at the
+    end of the unique index instead of splitting random B-tree pages.
+    """
+    ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (
+        (ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76                    # version
+        | (rand >> 62 & 0xFFF) << 64   # rand_a (12 bits)
+        | 0b10 << 62                   # variant
+        | rand & ((1 << 62) - 1)       # rand_b (62 bits)
+    )
+    return value.to_bytes(16, "big")
+
+
+class CurrentTimestampOnUpdate(ColumnElement):
+    """
+    server_default for updated_at columns: "CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"
+    on MySQL/MariaDB (the DB maintains the column), plain CURRENT_TIMESTAMP elsewhere
+    (e.g. the SQLite test database, which has no ON UPDATE clause).
+    """
+    inherit_cache = True
+
+
+@compiles(CurrentTimestampOnUpdate)
+def _compile_current_timestamp(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(CurrentTimestampOnUpdate, "mysql")
+@compiles(CurrentTimestampOnUpdate, "mariadb")
+def _compile_current_timestamp_mysql(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"
+
+
+OPTION_LETTERS = ("A", "B", "C", "D")  # a tuple, so .index() rejects "" and "AB"
+
+# BRD cap on question text, enforced in Question._check_question_text_len
+QUESTION_TEXT_MAX_LEN = 2000
+
+
+class OptionLetter(TypeDecorator):
+    """
+    An answer option stored as TINYINT 0..3 but read/written as 'A'..'D'.
+    Integer compares and 1-byte index entries instead of collated CHAR(1);
+    Python code (forms, CSV, JSON, templates) keeps using letters.
+    """
+    impl = db.SmallInteger
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name in ("mysql", "mariadb"):
+            return dialect.type_descriptor(mysql.TINYINT(unsigned=True))
+        return dialect.type_descriptor(db.SmallInteger())
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return OPTION_LETTERS.index(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return OPTION_LETTERS[value]
+
+
 # ---------- Models ----------
 
 class Subject(db.Model):
@@ -64,28 +148,30 @@ class Question(db.Model):
     )
 
     # Core content (LaTeX-friendly TEXT). BRD cap = 2000 chars.
-    question_text = db.Column(db.Text, nullable=False)
+    # The TEXT columns are deferred as one "content" group: list/stats queries
+    # skip them, and pages that render a question use undefer_group("content").
+    question_text = deferred(db.Column(db.Text, nullable=False), group="content")
     question_image = db.Column(db.String(255), nullable=True)
 
-    option_a = db.Column(db.Text, nullable=False)
+    option_a = deferred(db.Column(db.Text, nullable=False), group="content")
     option_a_image = db.Column(db.String(255), nullable=True)
 
-    option_b = db.Column(db.Text, nullable=False)
+    option_b = deferred(db.Column(db.Text, nullable=False), group="content")
     option_b_image = db.Column(db.String(255), nullable=True)
 
-    option_c = db.Column(db.Text, nullable=False)
+    option_c = deferred(db.Column(db.Text, nullable=False), group="content")
     option_c_image = db.Column(db.String(255), nullable=True)
 
-    option_d = db.Column(db.Text, nullable=False)
+    option_d = deferred(db.Column(db.Text, nullable=False), group="content")
     option_d_image = db.Column(db.String(255), nullable=True)
 
-    correct_option = db.Column(db.CHAR(1), nullable=False)  # 'A' | 'B' | 'C' | 'D'
+    correct_option = db.Column(OptionLetter, nullable=False)  # 'A' | 'B' | 'C' | 'D'
 
     # Stats + difficulty
     correct_count = db.Column(db.Integer, nullable=False, server_default=text("0"))
     total_attempts = db.Column(db.Integer, nullable=False, server_default=text("0"))
     difficulty = db.Column(
-        db.Enum(DifficultyEnum, native_enum=False, length=10),
+        db.Enum(DifficultyEnum, native_enum=True),
         nullable=False,
         server_default=text("'unrated'"),
         index=True,
@@ -93,8 +179,12 @@ class Question(db.Model):
     last_difficulty_update = db.Column(db.DateTime, nullable=True)
 
     created_at = db.Column(db.DateTime, nullable=False, server_default=func.now())
+    # Maintained by MySQL itself, so ORM UPDATEs don't carry an updated_at=NOW() bind
     updated_at = db.Column(
-        db.DateTime, nullable=False, server_default=func.now(), onupdate=func.now()
+        db.DateTime,
+        nullable=False,
+        server_default=CurrentTimestampOnUpdate(),
+        server_onupdate=FetchedValue(),
     )
 
     subject = db.relationship("Subject", back_populates="questions")
@@ -104,20 +194,23 @@ class Question(db.Model):
     )
 
     __table_args__ = (
-        # Ensure correct_option is only A/B/C/D
+        # Ensure correct_option is only A/B/C/D (stored as 0..3)
         CheckConstraint(
-            "correct_option in ('A','B','C','D')",
+            "correct_option BETWEEN 0 AND 3",
             name="ck_questions_correct_option_abcd",
         ),
-        # Enforce BRD max length 2000 (CHAR_LENGTH works in MySQL/MariaDB)
-        CheckConstraint(
-            "CHAR_LENGTH(question_text) <= 2000",
-            name="ck_questions_question_text_len_le_2000",
-        ),
         Index("ix_questions_subject_difficulty", "subject_id", "difficulty"),
         Index("ix_questions_created_at", "created_at"),
     )
 
+    @validates("question_text")
+    def _check_question_text_len(self, key, value):
+        # Checked here rather than with a CHAR_LENGTH() CHECK constraint, so MySQL
+        # doesn't rescan the UTF-8 text on every INSERT/UPDATE.
+        if value is not None and len(value) > QUESTION_TEXT_MAX_LEN:
+            raise ValueError(f"question_text exceeds {QUESTION_TEXT_MAX_LEN} characters")
+        return value
+
     def __repr__(self):
         return f"<Question id={self.id} subject_id={self.subject_id} diff={self.difficulty.value}>"
 
@@ -127,23 +220,22 @@ class Test(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
 
-    # Unique public/review ID (interactive only; can be null for display)
-    test_uid = db.Column(db.String(36), unique=True, nullable=True, index=True)
+    # Unique public/review ID (interactive only; can be null for display).
+    # Stored as 16 raw UUID bytes; use test_uid_hex for URLs and display.
+    test_uid = db.Column(db.BINARY(16), unique=True, nullable=True, index=True)
 
     subject_id = db.Column(
         db.Integer, db.ForeignKey("subjects.id", ondelete="CASCADE"), nullable=False
     )
 
     difficulty_filter = db.Column(
-        db.Enum(
-            "easy", "medium", "hard", "mixed", "all", native_enum=False, length=10
-        ),
+        db.Enum("easy", "medium", "hard", "mixed", "all", native_enum=True),
         nullable=False,
         server_default=text("'all'"),
     )
 
     mode = db.Column(
-        db.Enum(ModeEnum, native_enum=False, length=12),
+        db.Enum(ModeEnum, native_enum=True),
         nullable=False,
         server_default=text("'display'"),
         index=True,
@@ -152,9 +244,10 @@ class Test(db.Model):
     total_questions = db.Column(db.Integer, nullable=False)
 
     timer_mode = db.Column(
-        db.Enum(TimerModeEnum, native_enum=False, length=12),
+        db.Enum(TimerModeEnum, native_enum=True),
         nullable=False,
-        server_default=text("'per-question'"),
+        # SQLAlchemy persists enum *names*, so the default is the name, not the value
+        server_default=text("'per_question'"),
     )
 
     per_question_duration = db.Column(db.Integer, nullable=True)  # seconds
@@ -162,7 +255,7 @@ class Test(db.Model):
     auto_advance = db.Column(db.Boolean, nullable=False, server_default=text("0"))
 
     status = db.Column(
-        db.Enum(TestStatusEnum, native_enum=False, length=12),
+        db.Enum(TestStatusEnum, native_enum=True),
         nullable=False,
         server_default=text("'active'"),
         index=True,
@@ -193,10 +286,32 @@ class Test(db.Model):
         Index("ix_tests_created_at", "created_at"),
     )
 
+    @hybrid_property
+    def test_uid_hex(self) -> str | None:
+        """32-char lowercase hex form of test_uid (what share links carry)."""
+        return self.test_uid.hex() if self.test_uid else None
+
+    @test_uid_hex.expression
+    def test_uid_hex(cls):
+        return func.lower(func.hex(cls.test_uid))
+
+    @staticmethod
+    def uid_from_hex(value: str) -> bytes | None:
+        """Parse a share-link UID back to its 16 stored bytes (None if malformed)."""
+        try:
+            return uuid.UUID(value).bytes
+        except ValueError:
+            return None
+
     def __repr__(self):
         return f"<Test id={self.id} mode={self.mode.value} status={self.status.value}>"
 
 
+# test_questions / test_responses are deliberately NOT partitioned by test_id:
+# InnoDB doesn't allow foreign keys on partitioned tables (we rely on the
+# ON DELETE CASCADE from tests/questions), and every unique key -- including
+# the `id` primary key -- would have to contain test_id. Every per-test query
+# already hits a (test_id, ...) index prefix, so pruning would buy little.
 class TestQuestion(db.Model):
     __tablename__ = "test_questions"
 
@@ -244,13 +359,23 @@ class TestResponse(db.Model):
         db.Integer, db.ForeignKey("questions.id", ondelete="CASCADE"), nullable=False
     )
 
-    selected_option = db.Column(db.CHAR(1), nullable=False)  # 'A'|'B'|'C'|'D'
-    correct_option = db.Column(db.CHAR(1), nullable=False)   # denormalized for fast review
-    is_correct = db.Column(db.Boolean, nullable=False, server_default=text("0"))
+    selected_option = db.Column(OptionLetter, nullable=False)  # 'A'|'B'|'C'|'D'
+    correct_option = db.Column(OptionLetter, nullable=False)   # denormalized for fast review
+    # Generated by the DB from the two columns above (VIRTUAL: no storage, always consistent)
+    is_correct = db.Column(
+        db.Boolean,
+        Computed("selected_option = correct_option", persisted=False),
+        # No nullable=False: MariaDB rejects NULL/NOT NULL on generated columns,
+        # and the value is never NULL anyway (both operands are NOT NULL)
+    )
 
     created_at = db.Column(db.DateTime, nullable=False, server_default=func.now())
+    # Maintained by MySQL itself, so ORM UPDATEs don't carry an updated_at=NOW() bind
     updated_at = db.Column(
-        db.DateTime, nullable=False, server_default=func.now(), onupdate=func.now()
+        db.DateTime,
+        nullable=False,
+        server_default=CurrentTimestampOnUpdate(),
+        server_onupdate=FetchedValue(),
     )
 
     test = db.relationship("Test", back_populates="responses")
@@ -258,22 +383,54 @@ class TestResponse(db.Model):
 
     __table_args__ = (
         CheckConstraint(
-            "selected_option in ('A','B','C','D')",
+            "selected_option BETWEEN 0 AND 3",
             name="ck_test_responses_selected_abcd",
         ),
         CheckConstraint(
-            "correct_option in ('A','B','C','D')",
+            "correct_option BETWEEN 0 AND 3",
             name="ck_test_responses_correct_abcd",
         ),
         UniqueConstraint(
             "test_id", "question_id", name="uq_test_responses_test_question"
         ),
         Index("ix_test_responses_test_correct", "test_id", "is_correct"),
+        # Covering index for review/score lookups by (test_id, question_id):
+        # selected/correct/is_correct are read straight from the index leaf.
+        Index(
+            "ix_test_responses_test_q_cover",
+            "test_id", "question_id", "selected_option", "correct_option", "is_correct",
+        ),
     )
 
     def __repr__(self):
         return f"<TestResponse test_id={self.test_id} qid={self.question_id} correct={self.is_correct}>"
 
+
+class BulkJob(db.Model):
+    """An admin bulk upload, imported in the background (see services/bulk_jobs.py)."""
+    __tablename__ = "bulk_jobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    status = db.Column(
+        db.Enum(BulkJobStatusEnum, native_enum=True),
+        nullable=False,
+        server_default=text("'queued'"),
+    )
+    created_count = db.Column(db.Integer, nullable=False, server_default=text("0"))
+    failed_count = db.Column(db.Integer, nullable=False, server_default=text("0"))
+    errors = db.Column(db.JSON, nullable=True)  # list of "Row N: ..." messages
+
+    created_at = db.Column(db.DateTime, nullable=False, server_default=func.now())
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (BulkJobStatusEnum.done, BulkJobStatusEnum.failed)
+
+    def __repr__(self):
+        return f"<BulkJob id={self.id} status={self.status.value}>"
+
 # -----------------------
 # Cleanup hooks
 # -----------------------
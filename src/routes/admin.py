@@ -2,27 +2,31 @@
 from __future__ import annotations
 
 from pathlib import Path
-import os, uuid, shutil
-from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app, Response, make_response, send_file
+import uuid, shutil
+from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app, g, jsonify, Response, send_file
 from werkzeug.utils import secure_filename
 from werkzeug.datastructures import FileStorage
+from werkzeug.http import generate_etag
 from sqlalchemy import func, case
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import undefer, undefer_group
 from wtforms import StringField, TextAreaField, SelectField, FileField, SubmitField
 from wtforms.validators import ValidationError, DataRequired, Length, AnyOf, Optional as Opt
 from flask_wtf import FlaskForm
-from PIL import Image
 
 from routes.auth import admin_required
 from extensions import db
-from models import Subject, Question
+from models import Subject, Question, BulkJob, QUESTION_TEXT_MAX_LEN
+from caches import subject_cache
+from services.bulk_jobs import submit_bulk_job
 
 
 import csv
+import gzip
 import io
 import zipfile
 import tempfile
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 
 
@@ -40,6 +44,72 @@ def _allowed_file(filename: str) -> bool:
     ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
     return ext in ALLOWED_EXT
 
+def _sniff_image_type(data: bytes) -> Optional[str]:
+    """Identify an image from its leading magic bytes (first 12 are enough); None if unknown."""
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if data.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if data.startswith((b"GIF87a", b"GIF89a")):
+        return "gif"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+def _check_image_magic(head: bytes) -> None:
+    """Raise ValueError unless `head` (the first 12 bytes) starts like a supported image."""
+    if _sniff_image_type(head) is None:
+        raise ValueError("Uploaded file is not a valid image.")
+
+def _strict_verify_image(fp) -> None:
+    """
+    Full Pillow parse of `fp` (path or file object), only when STRICT_IMAGE_VALIDATE
+    is on; Pillow is imported lazily. Raises ValueError on a broken image.
+    """
+    if not current_app.config.get("STRICT_IMAGE_VALIDATE"):
+        return
+    from PIL import Image
+    try:
+        with Image.open(fp) as img:
+            img.verify()
+    except Exception:
+        raise ValueError("Uploaded file is not a valid image.")
+
+def _validate_image(head: bytes, fp) -> None:
+    """Magic-byte check, plus the Pillow parse when STRICT_IMAGE_VALIDATE is on."""
+    _check_image_magic(head)
+    _strict_verify_image(fp)
+
+def _copy_with_limit(src, dst, limit: int, chunk_size: int = 64 * 1024,
+                     *, reported_limit: Optional[int] = None) -> int:
+    """
+    Copy src -> dst in chunks, raising ValueError once more than `limit` bytes
+    have been read. Returns the number of bytes copied. `reported_limit` is the
+    size cap named in the error (defaults to `limit`), for callers that have
+    already consumed part of the file.
+    """
+    total = 0
+    while chunk := src.read(chunk_size):
+        total += len(chunk)
+        if total > limit:
+            cap = limit if reported_limit is None else reported_limit
+            raise ValueError(f"File too large (>{cap} bytes).")
+        dst.write(chunk)
+    return total
+
+def _ensure_subject_dir(subject_id: int) -> Path:
+    """
+    UPLOAD_DIR/<subject_id>, created if needed. Memoized on `g`, so a bulk upload
+    does one mkdir per subject per request rather than one per image.
+    """
+    created = g.setdefault("_upload_dirs", {})
+    target_dir = created.get(subject_id)
+    if target_dir is None:
+        target_dir = Path(current_app.config["UPLOAD_DIR"]).resolve() / str(subject_id)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        created[subject_id] = target_dir
+    return target_dir
+
 def _save_image(file_storage, subject_id: int) -> str:
     """
     Validate and save an uploaded image under UPLOAD_DIR/<subject_id>/.
@@ -52,33 +122,28 @@ def _save_image(file_storage, subject_id: int) -> str:
     if not _allowed_file(filename):
         raise ValueError("Unsupported file type. Allowed: " + ", ".join(sorted(ALLOWED_EXT)))
 
-    # Enforce size limit
-    file_storage.stream.seek(0, os.SEEK_END)
-    size = file_storage.stream.tell()
-    file_storage.stream.seek(0)
-    if size > MAX_IMAGE_BYTES:
-        raise ValueError(f"File too large (>{MAX_IMAGE_BYTES} bytes).")
-
-    # Basic image sanity check (Pillow)
-    try:
-        img = Image.open(file_storage.stream)
-        img.verify()  # verifies but doesn't decode; cheap
-    except Exception:
-        raise ValueError("Uploaded file is not a valid image.")
-
-    # Reset stream for saving
-    file_storage.stream.seek(0)
+    # Basic image sanity check on the first bytes, before anything is written
+    src = file_storage.stream
+    src.seek(0)
+    head = src.read(12)
+    _check_image_magic(head)
 
     # Build unique filename
     ext = filename.rsplit(".", 1)[-1].lower()
     unique = f"{uuid.uuid4().hex}.{ext}"
 
-    base_dir = Path(current_app.config["UPLOAD_DIR"]).resolve()
-    target_dir = base_dir / str(subject_id)
-    target_dir.mkdir(parents=True, exist_ok=True)
+    target_dir = _ensure_subject_dir(subject_id)
 
+    # Stream to disk in 64KB chunks, enforcing the size limit as we go
     full_path = target_dir / unique
-    file_storage.save(full_path)
+    try:
+        with open(full_path, "wb") as dst:
+            dst.write(head)
+            _copy_with_limit(src, dst, MAX_IMAGE_BYTES - len(head), reported_limit=MAX_IMAGE_BYTES)
+        _strict_verify_image(full_path)
+    except ValueError:
+        full_path.unlink(missing_ok=True)
+        raise
 
     # Return path relative to UPLOAD_DIR root for easier moves later
     rel_path = str(Path("questions") / str(subject_id) / unique)
@@ -109,7 +174,7 @@ def TextOrImageRequired(text_field_name: str, image_field_name: str):
 
 class QuestionForm(FlaskForm):
     subject_id = SelectField("Subject", coerce=int, validators=[DataRequired()])
-    question_text = TextAreaField("Question (LaTeX allowed)", validators=[TextOrImageRequired("Question", "question_image"), Length(max=2000)])
+    question_text = TextAreaField("Question (LaTeX allowed)", validators=[TextOrImageRequired("Question", "question_image"), Length(max=QUESTION_TEXT_MAX_LEN)])
     # Optional question image
     question_image = FileField("Question image (optional)", validators=[Opt()])
 
@@ -141,7 +206,7 @@ class DeleteForm(FlaskForm):
 @admin_bp.route("/")
 @admin_required
 def dashboard():
-    subjects_count = Subject.query.count()
+    subjects_count = len(subject_cache.all())
     questions_count = Question.query.count()
     images_count = Question.query.filter(
         (Question.question_image.isnot(None)) |
@@ -152,6 +217,7 @@ def dashboard():
     ).count()
     recent_questions = (
         Question.query
+        .options(undefer(Question.question_text))  # snippet only; options stay deferred
         .order_by(
             case((Question.updated_at == None, 1), else_=0),  # NULLs last
             Question.updated_at.desc()
@@ -164,18 +230,23 @@ def dashboard():
         subjects_count=subjects_count,
         questions_count=questions_count,
         images_count=images_count,
-        recent_questions=recent_questions
+        recent_questions=recent_questions,
+        subject_names=subject_cache.names(),
     )
 
 
 
+def _subject_choices() -> List[Tuple[int, str]]:
+    """(id, name) choices for the subject SelectField, from the subject cache."""
+    return subject_cache.choices()
+
 # ---------- Subjects CRUD ----------
 
 @admin_bp.route("/subjects", methods=["GET"])
 @admin_required
 def subjects():
     """List subjects + create form."""
-    subjects = Subject.query.order_by(Subject.name.asc()).all()
+    subjects = subject_cache.all()
     return render_template("admin/subjects.html", subjects=subjects, edit_mode=False, form_data={})
 
 @admin_bp.route("/subjects", methods=["POST"])
@@ -201,7 +272,7 @@ def subjects_create():
             errors["name"] = "A subject with this name already exists."
 
     if errors:
-        subjects = Subject.query.order_by(Subject.name.asc()).all()
+        subjects = subject_cache.all()
         flash("Please fix the errors below.", "error")
         return render_template(
             "admin/subjects.html",
@@ -225,8 +296,8 @@ def subjects_create():
 @admin_required
 def subjects_edit(subject_id: int):
     """Render edit form (using same template)."""
-    subj = Subject.query.get_or_404(subject_id)
-    subjects = Subject.query.order_by(Subject.name.asc()).all()
+    subj = db.get_or_404(Subject, subject_id)
+    subjects = subject_cache.all()
     return render_template(
         "admin/subjects.html",
         subjects=subjects,
@@ -239,7 +310,7 @@ def subjects_edit(subject_id: int):
 @admin_required
 def subjects_update(subject_id: int):
     """Update an existing subject with validation."""
-    subj = Subject.query.get_or_404(subject_id)
+    subj = db.get_or_404(Subject, subject_id)
     name = (request.form.get("name") or "").strip()
 
     errors = {}
@@ -258,7 +329,7 @@ def subjects_update(subject_id: int):
             errors["name"] = "Another subject with this name already exists."
 
     if errors:
-        subjects = Subject.query.order_by(Subject.name.asc()).all()
+        subjects = subject_cache.all()
         flash("Please fix the errors below.", "error")
         return render_template(
             "admin/subjects.html",
@@ -283,7 +354,7 @@ def subjects_update(subject_id: int):
 @admin_required
 def subjects_delete(subject_id: int):
     """Delete a subject. (Questions will cascade if your model is set to do so.)"""
-    subj = Subject.query.get_or_404(subject_id)
+    subj = db.get_or_404(Subject, subject_id)
     try:
         db.session.delete(subj)
         db.session.commit()
@@ -297,23 +368,60 @@ def subjects_delete(subject_id: int):
 # Questions: List / Filter
 # -----------------------
 
+QUESTIONS_PER_PAGE = 25
+QUESTION_PREVIEW_CHARS = 200  # the template shows ~160 after stripping tags
+
 @admin_bp.route("/questions", methods=["GET"])
 @admin_required
 def questions():
+    """
+    Keyset-paginated list, newest first: ?before_id=N pages to older questions,
+    ?after_id=N back to newer ones. Each page is an index range scan on id;
+    no OFFSET and no COUNT(*).
+    """
     subject_id = request.args.get("subject_id", type=int)
-    page = request.args.get("page", 1, type=int)
-    per_page = 20  # adjust as needed
-
-    q = Question.query
+    before_id = request.args.get("before_id", type=int)
+    after_id = request.args.get("after_id", type=int)
+
+    # Only the columns the list renders; the text is cut to a preview in the DB
+    q = db.session.query(
+        Question.id,
+        Question.subject_id,
+        Question.correct_option,
+        func.substr(Question.question_text, 1, QUESTION_PREVIEW_CHARS).label("preview"),
+    )
     if subject_id:
         q = q.filter(Question.subject_id == subject_id)
 
-    pagination = q.order_by(Question.id.desc()).paginate(page=page, per_page=per_page, error_out=False)
-    questions = pagination.items
-    subjects = Subject.query.order_by(Subject.name.asc()).all()
+    # Fetch one extra row to learn whether there is a further page
+    if after_id:
+        rows = q.filter(Question.id > after_id).order_by(Question.id.asc()).limit(QUESTIONS_PER_PAGE + 1).all()
+        has_prev, has_next = len(rows) > QUESTIONS_PER_PAGE, True
+        rows = rows[:QUESTIONS_PER_PAGE][::-1]
+    else:
+        if before_id:
+            q = q.filter(Question.id < before_id)
+        rows = q.order_by(Question.id.desc()).limit(QUESTIONS_PER_PAGE + 1).all()
+        has_prev, has_next = before_id is not None, len(rows) > QUESTIONS_PER_PAGE
+        rows = rows[:QUESTIONS_PER_PAGE]
+
+    pagination = {
+        "has_prev": has_prev and bool(rows),
+        "has_next": has_next and bool(rows),
+        "prev_after_id": rows[0].id if rows else None,
+        "next_before_id": rows[-1].id if rows else None,
+    }
 
     delete_form = DeleteForm()
-    return render_template("admin/questions_list.html", questions=questions, subjects=subjects, selected_subject_id=subject_id, delete_form=delete_form, pagination=pagination)
+    return render_template(
+        "admin/questions_list.html",
+        questions=rows,
+        subjects=subject_cache.all(),
+        subject_names=subject_cache.names(),
+        selected_subject_id=subject_id,
+        delete_form=delete_form,
+        pagination=pagination,
+    )
 
 # -----------------------
 # Questions: Create
@@ -324,7 +432,7 @@ def questions():
 def questions_new():
     form = QuestionForm()
     # Populate subject choices
-    form.subject_id.choices = [(s.id, s.name) for s in Subject.query.order_by(Subject.name.asc()).all()]
+    form.subject_id.choices = _subject_choices()
 
     if form.validate_on_submit():
         try:
@@ -368,10 +476,10 @@ def questions_new():
 @admin_bp.route("/questions/<int:qid>/edit", methods=["GET", "POST"])
 @admin_required
 def questions_edit(qid: int):
-    q = Question.query.get_or_404(qid)
+    q = db.get_or_404(Question, qid, options=[undefer_group("content")])
 
     form = QuestionForm(obj=q)
-    form.subject_id.choices = [(s.id, s.name) for s in Subject.query.order_by(Subject.name.asc()).all()]
+    form.subject_id.choices = _subject_choices()
 
     if form.validate_on_submit():
         try:
@@ -422,7 +530,7 @@ def questions_edit(qid: int):
 @admin_bp.route("/questions/<int:qid>/delete", methods=["POST"])
 @admin_required
 def questions_delete(qid: int):
-    q = Question.query.get_or_404(qid)
+    q = db.get_or_404(Question, qid)
     try:
         db.session.delete(q)
         db.session.commit()
@@ -454,20 +562,14 @@ def _save_image_from_bytes(data: bytes, original_name: str, subject_id: int) ->
     if len(data) > MAX_IMAGE_BYTES:
         raise ValueError(f"File too large (>{MAX_IMAGE_BYTES} bytes).")
 
-    # Validate image via Pillow
-    try:
-        img = Image.open(io.BytesIO(data))
-        img.verify()
-    except Exception:
-        raise ValueError("Uploaded file is not a valid image.")
+    # Basic image sanity check
+    _validate_image(data[:12], io.BytesIO(data))
 
     # Build unique filename
     ext = original_name.rsplit(".", 1)[-1].lower()
     unique = f"{uuid.uuid4().hex}.{ext}"
 
-    base_dir = Path(current_app.config["UPLOAD_DIR"]).resolve()
-    target_dir = base_dir / str(subject_id)
-    target_dir.mkdir(parents=True, exist_ok=True)
+    target_dir = _ensure_subject_dir(subject_id)
 
     full_path = target_dir / unique
     with open(full_path, "wb") as f:
@@ -477,114 +579,135 @@ def _save_image_from_bytes(data: bytes, original_name: str, subject_id: int) ->
     rel_path = rel_path.replace("\\", "/")
     return rel_path
 
-def _zip_members_map(zip_fs: Optional[FileStorage]) -> Dict[str, str]:
+def _zip_index(zf: zipfile.ZipFile) -> Dict[str, zipfile.ZipInfo]:
     """
-    Build a case-insensitive map of filename -> canonical zip member name.
-    We strip directories and only keep the final basename.
-    Returns dict with keys lowercased basenames.
+    Build a case-insensitive map of basename -> ZipInfo for the archive's files.
+    Directories are stripped; keys are lowercased basenames.
     """
-    mapping: Dict[str, str] = {}
-    if not zip_fs or not zip_fs.filename:
-        return mapping
-
-    zip_bytes = zip_fs.read()
-    # reset stream for safety if needed later
-    zip_fs.stream = io.BytesIO(zip_bytes)
-
-    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
-        for name in zf.namelist():
-            if name.endswith("/"):
-                continue
-            base = Path(name).name  # strip directories
-            mapping[base.lower()] = name
-    return mapping
-
-def _read_zip_member(zip_fs: FileStorage, member_name: str) -> bytes:
+    return {Path(info.filename).name.lower(): info for info in zf.infolist() if not info.is_dir()}
+
+def _read_zip_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo) -> bytes:
     """
-    Read raw bytes of a member from a zip FileStorage (member_name must be exact in the archive).
+    Read a member's bytes from an open ZipFile. Reads at most MAX_IMAGE_BYTES + 1,
+    so an oversized (or bogus-header) member is rejected without inflating all of it.
     """
-    zip_fs.stream.seek(0)
-    with zipfile.ZipFile(zip_fs.stream) as zf:
-        with zf.open(member_name) as f:
-            return f.read()
+    if info.file_size > MAX_IMAGE_BYTES:
+        raise ValueError(f"File too large (>{MAX_IMAGE_BYTES} bytes).")
+    with zf.open(info) as f:
+        return f.read(MAX_IMAGE_BYTES + 1)
 
 # ---------- CSV Parsing & Row Handling ----------
 
-REQUIRED_COLUMNS = [
+# Already normalized (lowercase); tuples keep error messages in column order
+REQUIRED_COLUMNS = (
     "subject", "question_text", "option_a", "option_b", "option_c", "option_d", "correct_option"
-]
-OPTIONAL_IMAGE_COLUMNS = [
+)
+OPTIONAL_IMAGE_COLUMNS = (
     "question_image",
     "option_a_image", "option_b_image", "option_c_image", "option_d_image",
-]
+)
+_REQUIRED_SET = frozenset(REQUIRED_COLUMNS)
+_OPTION_LETTERS = frozenset("ABCD")
 
 def _normalize_header(h: str) -> str:
     return h.strip().lower()
 
-def _get_subject_id_by_name(name: str) -> Optional[int]:
-    if not name:
-        return None
-    subj = Subject.query.filter(func.lower(Subject.name) == name.lower()).first()
-    return subj.id if subj else None
+def _subject_ids_by_name() -> Dict[str, int]:
+    """Map lowercased subject name -> id, loaded with one query per upload."""
+    rows = db.session.query(func.lower(Subject.name), Subject.id).all()
+    return {lname: sid for lname, sid in rows}
 
 def _validate_row_dict(row: dict) -> Tuple[bool, str]:
-    # required fields present?
+    # required fields present? (values are already stripped)
     for col in REQUIRED_COLUMNS:
-        if _normalize_header(col) not in row or not (row.get(col) or "").strip():
+        if not row.get(col):
             return False, f"Missing required field: {col}"
 
     # correct_option valid?
-    co = (row.get("correct_option") or "").strip().upper()
-    if co not in {"A", "B", "C", "D"}:
+    co = row["correct_option"].upper()
+    if co not in _OPTION_LETTERS:
         return False, "correct_option must be one of A, B, C, D"
 
     # question_text length
-    if len((row.get("question_text") or "")) > 2000:
-        return False, "question_text exceeds 2000 characters"
+    if len((row.get("question_text") or "")) > QUESTION_TEXT_MAX_LEN:
+        return False, f"question_text exceeds {QUESTION_TEXT_MAX_LEN} characters"
 
     return True, ""
 
-# ---------- Route: Bulk Upload ----------
+# Rows are inserted in chunks of this size, one SAVEPOINT + commit per chunk
+BULK_INSERT_CHUNK = 500
 
-@admin_bp.route("/bulk-upload", methods=["GET", "POST"])
-@admin_required
-def bulk_upload():
-    form = BulkUploadForm()
-    summary = None
-    errors = []
-    successes = 0
+def _insert_chunk(pending: List[Tuple[int, Question]], errors: List[str]) -> int:
+    """
+    Insert a chunk of (row_num, Question) pairs and commit; returns how many were created.
+    The chunk goes in under one savepoint. If that fails, it is retried row by row
+    (each under its own savepoint) so the error is reported against the right row.
+    """
+    if not pending:
+        return 0
+    # Only constraint/data errors are caught: those roll back just the savepoint.
+    # Anything else (lost connection, failed commit) propagates and fails the job.
+    try:
+        with db.session.begin_nested():
+            db.session.add_all([q for _, q in pending])
+    except (IntegrityError, DataError):
+        pass  # fall through to row-by-row
+    else:
+        db.session.commit()
+        return len(pending)
 
-    if form.validate_on_submit():
-        csv_fs: FileStorage = form.csv_file.data
-        zip_fs: Optional[FileStorage] = form.images_zip.data if form.images_zip.data and form.images_zip.data.filename else None
+    created = 0
+    for row_num, q in pending:
+        try:
+            with db.session.begin_nested():
+                db.session.add(q)
+            created += 1
+        except (IntegrityError, DataError):
+            errors.append(f"Row {row_num}: Database error while inserting.")
+    db.session.commit()
+    return created
+
+def _check_csv_header(csv_path: str) -> List[str]:
+    """Errors for a staged CSV whose header row is unreadable or lacks required columns."""
+    try:
+        with open(csv_path, encoding="utf-8-sig", newline="") as f:  # handle BOM if present
+            headers = [_normalize_header(h) for h in next(csv.reader(f), [])]
+    except UnicodeDecodeError:
+        return ["CSV is not UTF-8 encoded. Save as UTF-8 and try again."]
+    except Exception as e:
+        return [f"Failed to read CSV: {e}"]
+    missing = _REQUIRED_SET.difference(headers)
+    return [f"CSV missing required column: {col}" for col in REQUIRED_COLUMNS if col in missing]
+
+def _import_rows(csv_path: str, zip_path: Optional[str]) -> Tuple[int, List[str]]:
+    """
+    Import a staged CSV (+ optional images ZIP); runs as a background bulk job.
+    Returns (questions created, per-row error messages).
+    """
+    errors: List[str] = []
+    successes = 0
 
-        # Build quick lookup map for images inside the ZIP, if provided
-        zip_map = _zip_members_map(zip_fs) if zip_fs else {}
+    # Open the ZIP once for the whole import (central directory parsed once),
+    # and build a quick lookup map for the images inside it
+    zf = zipfile.ZipFile(zip_path) if zip_path else None
+    zip_map = _zip_index(zf) if zf else {}
 
-        # Read CSV rows
-        try:
-            csv_bytes = csv_fs.read()
-            csv_text = csv_bytes.decode("utf-8-sig")  # handle BOM if present
-            reader = csv.DictReader(io.StringIO(csv_text))
-            headers = [ _normalize_header(h) for h in (reader.fieldnames or []) ]
-
-            # Basic header validation
-            for col in REQUIRED_COLUMNS:
-                if col not in headers:
-                    errors.append(f"CSV missing required column: {col}")
-            for opt in OPTIONAL_IMAGE_COLUMNS:
-                # optional, do not error if missing
-                pass
-            if errors:
-                return render_template("admin/bulk_upload.html", form=form, summary=None, errors=errors), 400
-
-            # Process each row independently
+    # Read CSV rows, decoding/parsing the file incrementally as we go
+    try:
+        with open(csv_path, encoding="utf-8-sig", newline="") as text_stream:  # handle BOM if present
+            reader = csv.DictReader(text_stream)
+            # Normalize the header once; rows are then keyed by the normalized names
+            reader.fieldnames = [_normalize_header(h) for h in (reader.fieldnames or [])]
+            subject_index = _subject_ids_by_name()
+
+            # Validate/resolve each row independently; valid rows are inserted in chunks
+            pending: List[Tuple[int, Question]] = []
             row_num = 1  # header = row 1
             for row in reader:
                 row_num += 1
 
-                # Make uniform lower keys
-                normalized = { _normalize_header(k): (v or "").strip() for k, v in row.items() }
+                # Strip values (surplus cells beyond the header land under the None key)
+                normalized = {k: (v or "").strip() for k, v in row.items() if k is not None}
 
                 ok, msg = _validate_row_dict(normalized)
                 if not ok:
@@ -592,7 +715,7 @@ def bulk_upload():
                     continue
 
                 subject_name = normalized["subject"]
-                subject_id = _get_subject_id_by_name(subject_name)
+                subject_id = subject_index.get(subject_name.lower())
                 if not subject_id:
                     errors.append(f"Row {row_num}: Subject '{subject_name}' not found. Create it first.")
                     continue
@@ -602,16 +725,16 @@ def bulk_upload():
                     fn = normalized.get(field) or ""
                     if not fn:
                         return None
-                    if not zip_fs:
+                    if zf is None:
                         errors.append(f"Row {row_num}: '{field}' refers to '{fn}', but no ZIP was uploaded.")
                         return None
                     key = Path(fn).name.lower()
-                    member = zip_map.get(key)
-                    if not member:
+                    info = zip_map.get(key)
+                    if not info:
                         errors.append(f"Row {row_num}: Image '{fn}' not found in ZIP.")
                         return None
                     try:
-                        data = _read_zip_member(zip_fs, member)
+                        data = _read_zip_member(zf, info)
                         return _save_image_from_bytes(data, original_name=fn, subject_id=subject_id)
                     except ValueError as e:
                         errors.append(f"Row {row_num}: {field} invalid - {e}")
@@ -641,79 +764,172 @@ def bulk_upload():
                         option_d_image=od_img,
                         correct_option=normalized["correct_option"].upper(),
                     )
-                    db.session.add(q)
-                    db.session.commit()
-                    successes += 1
-                except IntegrityError:
-                    db.session.rollback()
-                    errors.append(f"Row {row_num}: Database error while inserting.")
                 except Exception as e:
-                    db.session.rollback()
                     errors.append(f"Row {row_num}: Unexpected error: {e}")
+                    continue
 
-        except UnicodeDecodeError:
-            errors.append("CSV is not UTF-8 encoded. Save as UTF-8 and try again.")
-        except Exception as e:
-            errors.append(f"Failed to read CSV: {e}")
+                pending.append((row_num, q))
+                if len(pending) >= BULK_INSERT_CHUNK:
+                    successes += _insert_chunk(pending, errors)
+                    pending = []
 
-        summary = {
-            "created": successes,
-            "failed": len(errors),
-        }
+            successes += _insert_chunk(pending, errors)
 
-    return render_template("admin/bulk_upload.html", form=form, summary=summary, errors=errors)
+    except UnicodeDecodeError:
+        errors.append("CSV is not UTF-8 encoded. Save as UTF-8 and try again.")
+    except Exception as e:
+        errors.append(f"Failed to read CSV: {e}")
+    finally:
+        if zf is not None:
+            zf.close()
 
+    return successes, errors
 
-# Create a downloadable template for question upload format 
-@admin_bp.route("/download-template", methods=["GET"])
+# ---------- Route: Bulk Upload ----------
+
+@admin_bp.route("/bulk-upload", methods=["GET", "POST"])
 @admin_required
-def download_template():
+def bulk_upload():
     """
-    Serve a CSV template for bulk question upload.
-    Append ?sample=1 to include one example row.
+    Stage the uploaded CSV/ZIP on disk and hand them to a background job;
+    the browser is redirected to the job page, which polls for the result.
     """
-    headers = [
-        "subject",
-        "question_text",
-        "question_image",
-        "option_a",
-        "option_a_image",
-        "option_b",
-        "option_b_image",
-        "option_c",
-        "option_c_image",
-        "option_d",
-        "option_d_image",
-        "correct_option",
-    ]
+    form = BulkUploadForm()
 
-    include_sample = request.args.get("sample") in ("1", "true", "True", "yes")
-    sample_row = {
-        "subject": "Physics",
-        "question_text": r"What is \(E=mc^2\)?",
-        "question_image": "",
-        "option_a": "Energy equivalence",
-        "option_a_image": "",
-        "option_b": "Mass",
-        "option_b_image": "",
-        "option_c": "Speed of light",
-        "option_c_image": "c.png",
-        "option_d": "All of these",
-        "option_d_image": "",
-        "correct_option": "D",
+    if form.validate_on_submit():
+        csv_fs: FileStorage = form.csv_file.data
+        zip_fs: Optional[FileStorage] = form.images_zip.data if form.images_zip.data and form.images_zip.data.filename else None
+
+        work_dir = Path(tempfile.mkdtemp(prefix="bulk-upload-"))
+        csv_path = str(work_dir / "questions.csv")
+        csv_fs.save(csv_path)
+        zip_path = None
+        if zip_fs:
+            zip_path = str(work_dir / "images.zip")
+            zip_fs.save(zip_path)
+
+        # Reject unusable files now rather than from the background job
+        errors = _check_csv_header(csv_path)
+        if zip_path and not zipfile.is_zipfile(zip_path):
+            errors.append("Images ZIP is not a valid ZIP archive.")
+        if errors:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            return render_template("admin/bulk_upload.html", form=form, summary=None, errors=errors), 400
+
+        job = BulkJob()
+        db.session.add(job)
+        db.session.commit()
+        submit_bulk_job(job.id, str(work_dir), _import_rows, csv_path, zip_path)
+        return redirect(url_for("admin.bulk_job", job_id=job.id))
+
+    return render_template("admin/bulk_upload.html", form=form, summary=None, errors=[])
+
+def _job_payload(job: BulkJob) -> dict:
+    return {
+        "id": job.id,
+        "status": job.status.value,
+        "finished": job.is_finished,
+        "created": job.created_count,
+        "failed": job.failed_count,
     }
 
+@admin_bp.route("/bulk-upload/<int:job_id>", methods=["GET"])
+@admin_required
+def bulk_job(job_id: int):
+    """Bulk upload page showing a job's progress, then its summary and errors."""
+    job = db.get_or_404(BulkJob, job_id)
+    summary = {"created": job.created_count, "failed": job.failed_count} if job.is_finished else None
+    return render_template(
+        "admin/bulk_upload.html",
+        form=BulkUploadForm(),
+        job=job,
+        summary=summary,
+        errors=job.errors or [],
+    )
+
+@admin_bp.route("/bulk-upload/<int:job_id>/status", methods=["GET"])
+@admin_required
+def bulk_job_status(job_id: int):
+    """JSON progress for the job page to poll."""
+    job = db.get_or_404(BulkJob, job_id)
+    return jsonify(_job_payload(job))
+
+
+# Create a downloadable template for question upload format 
+TEMPLATE_HEADERS = [
+    "subject",
+    "question_text",
+    "question_image",
+    "option_a",
+    "option_a_image",
+    "option_b",
+    "option_b_image",
+    "option_c",
+    "option_c_image",
+    "option_d",
+    "option_d_image",
+    "correct_option",
+]
+TEMPLATE_SAMPLE_ROW = {
+    "subject": "Physics",
+    "question_text": r"What is \(E=mc^2\)?",
+    "question_image": "",
+    "option_a": "Energy equivalence",
+    "option_a_image": "",
+    "option_b": "Mass",
+    "option_b_image": "",
+    "option_c": "Speed of light",
+    "option_c_image": "c.png",
+    "option_d": "All of these",
+    "option_d_image": "",
+    "correct_option": "D",
+}
+
+def _build_template_csv(include_sample: bool) -> Dict[str, Tuple[bytes, str]]:
+    """
+    Render the upload template once, plain and gzipped.
+    Returns {"identity": (bytes, etag), "gzip": (bytes, etag)}.
+    """
     buf = io.StringIO()
-    writer = csv.DictWriter(buf, fieldnames=headers)
+    writer = csv.DictWriter(buf, fieldnames=TEMPLATE_HEADERS)
     writer.writeheader()
     if include_sample:
-        writer.writerow(sample_row)
+        writer.writerow(TEMPLATE_SAMPLE_ROW)
+    data = buf.getvalue().encode("utf-8")
+    gz = gzip.compress(data, compresslevel=9, mtime=0)  # mtime=0: same bytes on every worker
+    return {"identity": (data, generate_etag(data)), "gzip": (gz, generate_etag(gz))}
+
+# The template never changes at runtime, so both variants are built at import
+_TEMPLATE_CSV = {
+    False: _build_template_csv(False),
+    True: _build_template_csv(True),
+}
+
+@admin_bp.route("/download-template", methods=["GET"])
+@admin_required
+def download_template():
+    """
+    Serve a CSV template for bulk question upload.
+    Append ?sample=1 to include one example row.
+    """
+    include_sample = request.args.get("sample") in ("1", "true", "True", "yes")
+    encoding = "gzip" if request.accept_encodings["gzip"] else "identity"
+    csv_bytes, etag = _TEMPLATE_CSV[include_sample][encoding]
 
-    csv_bytes = buf.getvalue().encode("utf-8")
-    resp = make_response(csv_bytes)
-    resp.headers["Content-Type"] = "text/csv; charset=utf-8"
     filename = "questions_template.csv" if not include_sample else "questions_template_with_sample.csv"
-    resp.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    resp = send_file(
+        io.BytesIO(csv_bytes),
+        mimetype="text/csv",
+        as_attachment=True,
+        download_name=filename,
+        etag=etag,
+        conditional=True,
+    )
+    if encoding == "gzip":
+        resp.headers["Content-Encoding"] = "gzip"
+    resp.vary.add("Accept-Encoding")
+    # Admin-only, so cacheable by the browser but not by shared proxies
+    resp.headers["Cache-Control"] = "private, max-age=86400"
     return resp
 
 #-------Bulk Export-------#
@@ -727,10 +943,15 @@ def bulk_export():
     if not selected_ids:
         if request.method == "POST":
             flash("Please select at least one subject.", "error")
-        return render_template("admin/bulk_export.html", subjects=Subject.query.order_by(Subject.name.asc()).all())
+        return render_template("admin/bulk_export.html", subjects=subject_cache.all())
 
     # Query questions for selected subjects
-    questions = Question.query.filter(Question.subject_id.in_(selected_ids)).all()
+    questions = (
+        Question.query
+        .options(undefer_group("content"))
+        .filter(Question.subject_id.in_(selected_ids))
+        .all()
+    )
 
     if not questions:
         flash("No questions found for selected subjects.", "error")
@@ -2,6 +2,8 @@
 from __future__ import annotations
 from flask import Blueprint, request, jsonify
 from datetime import datetime, timezone
+from sqlalchemy import and_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 
 from extensions import db
 from models import (
@@ -11,6 +13,17 @@ from models import (
 
 api_bp = Blueprint("api", __name__)
 
+
+def _upsert_response_stmt(**values):
+    """
+    INSERT a TestResponse, or overwrite the answer if (test_id, question_id) exists
+    (MySQL/MariaDB ON DUPLICATE KEY UPDATE).
+    """
+    return mysql_insert(TestResponse).values(**values).on_duplicate_key_update(
+        selected_option=values["selected_option"],
+        correct_option=values["correct_option"],
+    )
+
 @api_bp.route("/heartbeat", methods=["POST"])
 def heartbeat():
     return {"status": "ok"}
@@ -40,10 +53,28 @@ def submit_answer(test_id: int):
     if selected_option not in {"A", "B", "C", "D"}:
         return jsonify({"ok": False, "error": "selected_option must be A/B/C/D"}), 400
 
-    # Load test and basic checks
-    test: Test | None = Test.query.get(test_id)
-    if not test:
+    # Load the test, the question's slot in it, the question's correct option and
+    # the currently saved answer (just those columns) in one round trip. Outer joins
+    # keep the "not found" cases apart: no row -> no such test; tq/correct None ->
+    # question isn't in this test; previous None -> not answered yet.
+    row = (
+        db.session.query(Test, TestQuestion, Question.correct_option, TestResponse.selected_option)
+        .select_from(Test)
+        .outerjoin(
+            TestQuestion,
+            and_(TestQuestion.test_id == Test.id, TestQuestion.question_id == question_id),
+        )
+        .outerjoin(Question, Question.id == TestQuestion.question_id)
+        .outerjoin(
+            TestResponse,
+            and_(TestResponse.test_id == Test.id, TestResponse.question_id == question_id),
+        )
+        .filter(Test.id == test_id)
+        .one_or_none()
+    )
+    if row is None:
         return jsonify({"ok": False, "error": "Test not found"}), 404
+    test, tq, correct, previous = row
 
     if test.status != TestStatusEnum.active:
         return jsonify({"ok": False, "error": "Test is not active"}), 403
@@ -63,11 +94,6 @@ def submit_answer(test_id: int):
             return jsonify({"ok": False, "error": "Time expired"}), 403
 
     # Ensure the question belongs to this test; optionally verify the sequence, if provided
-    tq: TestQuestion | None = (
-        TestQuestion.query
-        .filter_by(test_id=test.id, question_id=question_id)
-        .first()
-    )
     if not tq:
         return jsonify({"ok": False, "error": "Question not in this test"}), 400
 
@@ -76,35 +102,23 @@ def submit_answer(test_id: int):
         # return jsonify({"ok": False, "error": "Sequence mismatch"}), 400
         pass
 
-    # Load the canonical correct option
-    q: Question | None = Question.query.get(question_id)
-    if not q:
+    # The canonical correct option
+    if correct is None:
         return jsonify({"ok": False, "error": "Question not found"}), 404
 
-    is_correct = (selected_option == q.correct_option)
-
-    # Upsert TestResponse
-    resp: TestResponse | None = (
-        TestResponse.query
-        .filter_by(test_id=test.id, question_id=question_id)
-        .first()
-    )
+    is_correct = (selected_option == correct)
 
-    if resp:
-        resp.selected_option = selected_option
-        resp.correct_option = q.correct_option
-        resp.is_correct = is_correct
-    else:
-        resp = TestResponse(
+    # Re-submitting the saved answer (autosave, double clicks) needs no write at all
+    if selected_option != previous:
+        # Upsert TestResponse in one statement, keyed on uq_test_responses_test_question
+        # (is_correct is a generated column; the DB derives it from these two)
+        db.session.execute(_upsert_response_stmt(
             test_id=test.id,
             question_id=question_id,
             selected_option=selected_option,
-            correct_option=q.correct_option,
-            is_correct=is_correct,
-        )
-        db.session.add(resp)
-
-    db.session.commit()
+            correct_option=correct,
+        ))
+        db.session.commit()
 
     return jsonify({
         "ok": True,
@@ -1,16 +1,10 @@
-""" from flask import Blueprint
-
-auth_bp = Blueprint("auth", __name__)
-
-@auth_bp.route("/admin/login", methods=["GET", "POST"])
-def login():
-    return "Admin login page" """
-
-
-
 # routes/auth.py
 from __future__ import annotations
+import hmac
 import os
+import re
+import threading
+import time
 from functools import wraps
 
 import bcrypt
@@ -40,27 +34,107 @@ def _admin_secret_path() -> str:
     return path
 
 
-def _read_hashed_password() -> bytes | None:
-    """Read bcrypt hash stored on disk. Returns bytes or None if missing."""
+# The hash is kept in app.extensions and the file is only stat()ed again after
+# this many seconds -- re-read only if its mtime changed (e.g. `flask create-admin`).
+ADMIN_HASH_TTL = 5.0
+
+
+def _load_hash_file(path: str) -> bytes | None:
     try:
-        with open(_admin_secret_path(), "rb") as f:
+        with open(path, "rb") as f:
             data = f.read().strip()
             return data if data else None
     except FileNotFoundError:
         return None
 
 
-def _verify_password(plaintext: str) -> bool:
-    hashed = _read_hashed_password()
-    if not hashed:
-        # No admin password has been set yet
-        return False
+def _read_hashed_password() -> bytes | None:
+    """Bcrypt hash stored on disk (cached per app). Returns bytes or None if missing."""
+    cached = current_app.extensions.get("admin_hash")  # (hash, mtime_ns, checked_at)
+    now = time.monotonic()
+    if cached and now - cached[2] < ADMIN_HASH_TTL:
+        return cached[0]
+
+    path = _admin_secret_path()
     try:
-        return bcrypt.checkpw(plaintext.encode("utf-8"), hashed)
-    except ValueError:
-        # Hash on disk is malformed
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+    if cached and cached[1] == mtime:
+        hashed = cached[0]
+    else:
+        hashed = _load_hash_file(path) if mtime is not None else None
+    current_app.extensions["admin_hash"] = (hashed, mtime, now)
+    return hashed
+
+
+# bcrypt only looks at the first 72 bytes of a password (bcrypt >= 5 raises
+# ValueError beyond that), so longer ones are refused before hashing
+BCRYPT_MAX_PASSWORD_BYTES = 72
+_BCRYPT_HASH_RE = re.compile(rb"\$2[abxy]\$\d{2}\$[./A-Za-z0-9]{53}")
+
+
+_dummy_hash: bytes | None = None
+_dummy_hash_lock = threading.Lock()
+
+
+def _get_dummy_hash() -> bytes:
+    """
+    A throwaway bcrypt hash (not made at import: calibrating costs several hashes).
+    Its cost is calibrated exactly like create-admin's default, so checking against
+    it takes as long as checking against a real hash made on this machine.
+    """
+    global _dummy_hash
+    with _dummy_hash_lock:
+        if _dummy_hash is None:
+            rounds = _calibrate_rounds()
+            _dummy_hash = bcrypt.hashpw(b"not-the-admin-password", bcrypt.gensalt(rounds=rounds))
+    return _dummy_hash
+
+
+@auth_bp.record_once
+def _init_login(state):
+    """
+    One login semaphore per app, created at registration so requests never race
+    to make it. Web apps also build the dummy hash here, so no login request pays
+    for the calibration (CLI-only apps pass prepare_dummy_hash=False).
+    """
+    state.app.extensions["login_slots"] = threading.BoundedSemaphore(
+        state.app.config["LOGIN_MAX_CONCURRENT_HASHES"]
+    )
+    if state.options.get("prepare_dummy_hash", True):
+        _get_dummy_hash()
+
+
+def _acquire_login_slot() -> threading.BoundedSemaphore | None:
+    """
+    Take one of LOGIN_MAX_CONCURRENT_HASHES slots, waiting at most LOGIN_SLOT_WAIT
+    seconds; returns the semaphore to release, or None if no slot freed up. Each
+    login costs a full bcrypt hash, so this caps how much CPU a burst of
+    (unauthenticated) login POSTs can tie up in one process.
+    """
+    slots = current_app.extensions["login_slots"]
+    return slots if slots.acquire(timeout=current_app.config["LOGIN_SLOT_WAIT"]) else None
+
+
+def _verify_password(plaintext: str) -> bool:
+    """
+    Check the admin password. Always does one bcrypt hash -- against a dummy
+    hash when no (valid) password is set -- so the response time doesn't
+    reveal whether one is configured.
+    """
+    password = plaintext.encode("utf-8")
+    if len(password) > BCRYPT_MAX_PASSWORD_BYTES:
+        # create-admin never stores such a password, so it can't match
         return False
 
+    hashed = _read_hashed_password()
+    if hashed is not None and not _BCRYPT_HASH_RE.fullmatch(hashed):
+        # Hash on disk is malformed: treat it like "not set"
+        hashed = None
+    computed = bcrypt.hashpw(password, hashed or _get_dummy_hash())
+    return hashed is not None and hmac.compare_digest(computed, hashed)
+
 
 # ---------- Decorator ----------
 
@@ -88,16 +162,24 @@ def login():
         password = request.form.get("password", "")
         next_url = request.args.get("next") or request.form.get("next") or url_for("admin.dashboard")
 
-        if not _read_hashed_password():
-            flash("Admin password is not set. Ask the maintainer to run: flask create-admin", "error")
-            return render_template("auth/login.html", next=next_url), 400
+        slot = _acquire_login_slot()
+        if slot is None:
+            flash("Too many login attempts right now. Please try again in a moment.", "error")
+            return render_template("auth/login.html", next=next_url), 429
+        try:
+            ok = _verify_password(password)
+        finally:
+            slot.release()
 
-        if _verify_password(password):
+        if ok:
             session["is_admin"] = True
             flash("Logged in successfully.", "success")
             return redirect(next_url)
-        else:
-            flash("Invalid password.", "error")
+
+        # Same answer whether or not a password is configured; tell the operator instead
+        if not _read_hashed_password():
+            current_app.logger.warning("Admin login attempted but no admin password is set; run: flask create-admin")
+        flash("Invalid password.", "error")
 
     # GET or failed POST
     next_url = request.args.get("next", url_for("admin.dashboard"))
@@ -115,6 +197,20 @@ def logout():
 
 # ---------- CLI: create-admin ----------
 
+def _calibrate_rounds(target_ms: int = 300, min_rounds: int = 10, max_rounds: int = 15) -> int:
+    """
+    Smallest bcrypt cost (between min_rounds and max_rounds) whose hash takes at
+    least target_ms on this machine. Each extra round doubles the time, so this
+    stops after a few sample hashes.
+    """
+    for rounds in range(min_rounds, max_rounds + 1):
+        start = time.perf_counter_ns()
+        bcrypt.hashpw(b"calibrate", bcrypt.gensalt(rounds=rounds))
+        if (time.perf_counter_ns() - start) // 1_000_000 >= target_ms:
+            return rounds
+    return max_rounds
+
+
 @click.command("create-admin")
 @click.option(
     "--password",
@@ -123,16 +219,34 @@ def logout():
     confirmation_prompt=True,
     help="The admin password to hash and write to ADMIN_SECRET_FILE.",
 )
+@click.option(
+    "--rounds",
+    type=click.IntRange(4, 31),
+    default=None,
+    help="bcrypt cost factor. Default: calibrated on this machine (see --target-ms).",
+)
+@click.option(
+    "--target-ms",
+    type=click.IntRange(1, None),
+    default=300,
+    show_default=True,
+    help="Target hashing time used to calibrate the cost when --rounds is not given.",
+)
 @with_appcontext
-def create_admin_command(password: str):
+def create_admin_command(password: str, rounds: int | None, target_ms: int):
     """
     Hash the given password with bcrypt and store it in ADMIN_SECRET_FILE.
-    The file is created if it does not exist.
+    The file is created if it does not exist. The cost is stored in the hash
+    itself, so verification adapts to whatever was chosen here.
     """
     if not password or len(password) < 6:
         raise click.ClickException("Password must be at least 6 characters.")
+    if len(password.encode("utf-8")) > BCRYPT_MAX_PASSWORD_BYTES:
+        raise click.ClickException(f"Password must be at most {BCRYPT_MAX_PASSWORD_BYTES} bytes (UTF-8).")
 
-    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=12))
+    if rounds is None:
+        rounds = _calibrate_rounds(target_ms)
+    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=rounds))
 
     path = _admin_secret_path()
     os.makedirs(os.path.dirname(path), exist_ok=True)
@@ -147,4 +261,7 @@ def create_admin_command(password: str):
     except Exception:
         pass
 
-    click.echo(f"Wrote bcrypt hash to: {path}")
+    # Web workers notice the new mtime within ADMIN_HASH_TTL; drop this app's copy now
+    current_app.extensions.pop("admin_hash", None)
+
+    click.echo(f"Wrote bcrypt hash (cost {rounds}) to: {path}")
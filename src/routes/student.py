@@ -1,20 +1,19 @@
 # routes/student.py
 from __future__ import annotations
-import uuid
 from datetime import datetime, timedelta, timezone
-import random
-
 from flask import Blueprint, render_template, request, redirect, url_for, flash, abort
 from flask_wtf import FlaskForm
 from wtforms import SelectField, IntegerField, BooleanField, SubmitField
 from wtforms.validators import DataRequired, NumberRange
-from sqlalchemy import func
+from sqlalchemy import and_, func, insert
+from sqlalchemy.orm import Load, selectinload
 from services.test_service import compute_and_finalize_test, get_summary
 
+from caches import subject_cache
 from extensions import db
 from models import (
-    Subject, Question, Test, TestQuestion, TestResponse,
-    ModeEnum, TimerModeEnum, TestStatusEnum
+    Question, Test, TestQuestion, TestResponse,
+    ModeEnum, TimerModeEnum, TestStatusEnum, new_test_uid
 )
 
 
@@ -78,25 +77,35 @@ class StartTestForm(FlaskForm):
 # Helpers
 # -----------------------
 
+# Difficulty values that narrow the pool; anything else ("all", "mixed") doesn't
+FILTER_DIFFICULTIES = frozenset({"easy", "medium", "hard"})
+
 def _filter_questions_query(subject_id: int, difficulty: str):
     q = Question.query.filter(Question.subject_id == subject_id)
-    if difficulty in ("easy", "medium", "hard"):
+    if difficulty in FILTER_DIFFICULTIES:
         q = q.filter(Question.difficulty == difficulty)
     # "mixed" is handled at selection time if you implement balancing; here it behaves like "all"
     return q
 
-def _count_available(subject_id: int, difficulty: str) -> int:
-    return _filter_questions_query(subject_id, difficulty).count()
-
 def _select_random_question_ids(subject_id: int, difficulty: str, n: int):
     """
     Select N distinct question IDs randomly for the given subject (+ optional difficulty).
-    Efficient path: fetch IDs then python random.sample.
+    Returns (ids, available): the shuffle (ORDER BY RAND()) and LIMIT run in the database, and
+    COUNT(*) OVER () carries the size of the whole matching pool on each row, so
+    sampling and the availability check share one query. ids is [] when fewer
+    than N questions are available.
     """
-    ids = [row.id for row in _filter_questions_query(subject_id, difficulty).with_entities(Question.id).all()]
-    if len(ids) < n:
-        return []
-    return random.sample(ids, n)
+    rows = (
+        _filter_questions_query(subject_id, difficulty)
+        .with_entities(Question.id, func.count().over().label("available"))
+        .order_by(func.rand())
+        .limit(n)
+        .all()
+    )
+    available = rows[0].available if rows else 0
+    if available < n:
+        return [], available
+    return [row.id for row in rows], available
 
 # -----------------------
 # Routes
@@ -105,14 +114,17 @@ def _select_random_question_ids(subject_id: int, difficulty: str, n: int):
 @student_bp.route("/", methods=["GET"])
 def home():
     form = StartTestForm()
-    subjects = Subject.query.order_by(Subject.name.asc()).all()
-    form.subject_id.choices = [(s.id, s.name) for s in subjects]
-    #form.subject_id.choices = [(s.id, s.name) for s in Subject.query.order_by(Subject.name.asc()).all()]
+    form.subject_id.choices = subject_cache.choices()
 
-    # Build a map: subject_id -> total questions (keys as strings for easy JS lookup)
+    # Build a map: subject_id -> total questions (keys as strings for easy JS lookup),
+    # one GROUP BY instead of a COUNT per subject; subjects with no questions map to 0
+    counts = dict(
+        db.session.query(Question.subject_id, func.count(Question.id))
+        .group_by(Question.subject_id)
+    )
     available_map = {
-        str(s.id): Question.query.filter_by(subject_id=s.id).count()
-        for s in subjects
+        str(sid): counts.get(sid, 0)
+        for sid, _ in form.subject_id.choices
     }
 
     return render_template(
@@ -124,7 +136,7 @@ def home():
 @student_bp.route("/start-test", methods=["POST"])
 def start_test():
     form = StartTestForm()
-    form.subject_id.choices = [(s.id, s.name) for s in Subject.query.order_by(Subject.name.asc()).all()]
+    form.subject_id.choices = subject_cache.choices()
 
     if not form.validate_on_submit():
         flash("Please fix the errors in the form.", "error")
@@ -149,25 +161,19 @@ def start_test():
             flash("Total test duration must be at least 30 seconds.", "error")
             return render_template("student/start_test.html", form=form), 400
 
-    # Check availability
-    available = _count_available(subject_id, difficulty)
-    if requested_n > available:
-        flash(f"Requested {requested_n} questions but only {available} available for this subject/difficulty.", "error")
-        return render_template("student/start_test.html", form=form), 400
-
-    # Pick random distinct questions
-    qids = _select_random_question_ids(subject_id, difficulty, requested_n)
+    # Pick random distinct questions (and check availability in the same query)
+    qids, available = _select_random_question_ids(subject_id, difficulty, requested_n)
     if not qids:
-        flash("Unable to select questions. Please try a smaller number or different filter.", "error")
+        flash(f"Requested {requested_n} questions but only {available} available for this subject/difficulty.", "error")
         return render_template("student/start_test.html", form=form), 400
 
     # Build Test row
     mode = MODE_MAP[mode_str]
     timer_mode = TIMER_MAP[timer_mode_str]
-    test_uid = uuid.uuid4().hex if mode == ModeEnum.interactive else None
+    test_uid = new_test_uid() if mode == ModeEnum.interactive else None
 
     test = Test(
-    test_uid = (uuid.uuid4().hex if mode == ModeEnum.interactive else None),
+    test_uid = test_uid,
     subject_id = subject_id,
     difficulty_filter = difficulty,
     mode = mode,
@@ -184,38 +190,58 @@ def start_test():
     db.session.add(test)
     db.session.flush()  # to get test.id
 
-    # Insert TestQuestion sequence 1..N
-    seq = 1
-    for qid in qids:
-        db.session.add(TestQuestion(test_id=test.id, question_id=qid, sequence=seq)) 
-        seq += 1
+    # Insert TestQuestion sequence 1..N as one executemany (PyMySQL rewrites it
+    # into a single multi-row INSERT)
+    db.session.execute(
+        insert(TestQuestion),
+        [
+            {"test_id": test.id, "question_id": qid, "sequence": seq}
+            for seq, qid in enumerate(qids, start=1)
+        ],
+    )
 
     db.session.commit()
 
     # Redirect to question 1
     return redirect(url_for("student.test_page", test_id=test.id, q=1))
 
+def _load_slot(test: Test, n: int):
+    """
+    (test_question, question, response) for slot n of the test, in one joined
+    SELECT; response is None if unanswered, and all three are None if n is out of range.
+    """
+    if n < 1 or n > test.total_questions:
+        return None, None, None
+    row = (
+        db.session.query(TestQuestion, Question, TestResponse)
+        .join(Question, Question.id == TestQuestion.question_id)
+        .outerjoin(
+            TestResponse,
+            and_(TestResponse.test_id == test.id, TestResponse.question_id == Question.id),
+        )
+        .options(Load(Question).undefer_group("content"))
+        .filter(TestQuestion.test_id == test.id, TestQuestion.sequence == n)
+        .one_or_none()
+    )
+    return row if row is not None else (None, None, None)
+
+def _first_sequence(test_id: int) -> int | None:
+    """Lowest remaining slot of a test (slots vanish when their question is deleted)."""
+    return (
+        db.session.query(func.min(TestQuestion.sequence))
+        .filter(TestQuestion.test_id == test_id)
+        .scalar()
+    )
+
 def _load_nth_test_question(test_id: int, n: int):
-    """Return (test, test_question, question) or (None, None, None) if not found."""
-    test = Test.query.get_or_404(test_id)
+    """Return (test, test_question, question, response); all but test are None if not found."""
+    test = db.get_or_404(Test, test_id)
     if test.status != TestStatusEnum.active:
         # You can decide to redirect to review or forbid
-        return test, None, None
-
-    # bounds check
-    if n < 1 or n > test.total_questions:
-        return test, None, None
-
-    tq = (
-        TestQuestion.query
-        .filter_by(test_id=test.id, sequence=n)
-        .first()
-    )
-    if not tq:
-        return test, None, None
+        return test, None, None, None
 
-    q = Question.query.get(tq.question_id)
-    return test, tq, q
+    tq, q, resp = _load_slot(test, n)
+    return test, tq, q, resp
 
 
 @student_bp.route("/test/<int:test_id>", methods=["GET"])
@@ -223,26 +249,24 @@ def test_page(test_id):
     """Render the nth question (one-by-one runner)."""
     n = request.args.get("q", type=int, default=1)
 
-    test, tq, q = _load_nth_test_question(test_id, n)
+    test, tq, q, resp = _load_nth_test_question(test_id, n)
     if q is None:
-        # Out of range or not active → redirect to end/summary (you can adjust)
-        if test and test.status != TestStatusEnum.active:
+        # Out of range or not active → redirect to summary / first remaining question
+        if test.status != TestStatusEnum.active:
             flash("Test is not active.", "error")
-        else:
-            flash("Invalid question number.", "error")
-        # For now, go back to first question or to summary hook
-        return redirect(url_for("student.test_page", test_id=test_id, q=1))
+            if test.status == TestStatusEnum.completed:
+                return redirect(url_for("student.summary", test_id=test_id))
+            abort(404)
+        first = _first_sequence(test.id)
+        if first is None:
+            abort(404)
+        flash("Invalid question number.", "error")
+        return redirect(url_for("student.test_page", test_id=test_id, q=first))
 
     # Pre-fill selection for interactive mode (if any)
     selected_option = None
-    if test.mode == ModeEnum.interactive:
-        resp = (
-            TestResponse.query
-            .filter_by(test_id=test.id, question_id=q.id)
-            .first()
-        )
-        if resp:
-            selected_option = resp.selected_option
+    if test.mode == ModeEnum.interactive and resp:
+        selected_option = resp.selected_option
 
     end_iso = None
     if test.expected_end_time:
@@ -251,6 +275,13 @@ def test_page(test_id):
             exp = exp.replace(tzinfo=timezone.utc)
         end_iso = exp.isoformat()          # e.g., "2025-08-29T10:15:00+00:00"
     
+    # Navigation helpers: resolve the page route once, then vary only ?q=
+    has_prev = n > 1
+    has_next = n < test.total_questions
+    page_url = url_for("student.test_page", test_id=test.id)
+    prev_url = f"{page_url}?q={n - 1}" if has_prev else None
+    next_url = f"{page_url}?q={n + 1}" if has_next else None
+
     # Timer config payload for client JS
     timer_config = {
         "mode": test.mode.value,  # 'display' or 'interactive'
@@ -262,17 +293,11 @@ def test_page(test_id):
         "test_end_time": end_iso,
         "question_index": n,
         "total_questions": test.total_questions,
-        "next_url": url_for("student.test_page", test_id=test.id, q=n+1) if n < test.total_questions else None,
+        "next_url": next_url,
         "finish_url": url_for("student.finish_test", test_id=test.id),  # you will implement this route
         "submit_api": url_for("api.submit_answer", test_id=test.id) if test.mode == ModeEnum.interactive else None,  # you will implement this API
     }
 
-    # Navigation helpers
-    has_prev = n > 1
-    has_next = n < test.total_questions
-    prev_url = url_for("student.test_page", test_id=test.id, q=n-1) if has_prev else None
-    next_url = url_for("student.test_page", test_id=test.id, q=n+1) if has_next else None
-
     return render_template(
         "student/test_question.html",
         test=test,
@@ -295,22 +320,8 @@ def finish_test(test_id):
     return redirect(url_for("student.summary", test_id=test_id))
 
 def _load_review_n(test_id: int, n: int):
-    test = Test.query.get_or_404(test_id)
-    tqs = (
-        TestQuestion.query
-        .filter_by(test_id=test.id)
-        .order_by(TestQuestion.sequence.asc())
-        .all()
-    )
-    if n < 1 or n > len(tqs):
-        return test, None, None, None
-    tq = tqs[n-1]
-    q = Question.query.get_or_404(tq.question_id)
-    resp = (
-        TestResponse.query
-        .filter_by(test_id=test.id, question_id=q.id)
-        .first()
-    )
+    test = db.get_or_404(Test, test_id)
+    tq, q, resp = _load_slot(test, n)
     return test, tq, q, resp
 
 # Review by internal test_id (after completion)
@@ -322,8 +333,11 @@ def review(test_id):
         flash("Test not completed yet.", "error")
         return redirect(url_for("student.test_page", test_id=test_id, q=1))
     if not q:
-        # out of range: go to first
-        return redirect(url_for("student.review", test_id=test_id, q=1))
+        # out of range (or that slot's question was deleted): go to the first remaining one
+        first = _first_sequence(test.id)
+        if first is None:
+            abort(404)
+        return redirect(url_for("student.review", test_id=test_id, q=first))
 
     # Display rules:
     # - display mode: show correct answers only
@@ -342,10 +356,17 @@ def review(test_id):
         totals=totals
     )
 
+def _get_test_by_uid(test_uid: str, *options) -> Test:
+    """Look up a test by its public share UID (hex string); 404 if unknown."""
+    raw = Test.uid_from_hex(test_uid)
+    if raw is None:
+        abort(404)
+    return Test.query.options(*options).filter_by(test_uid=raw).first_or_404()
+
 # Public review by UID (interactive only, read-only)
 @student_bp.route("/review-by-uid/<string:test_uid>", methods=["GET"])
 def review_by_uid(test_uid):
-    test = Test.query.filter_by(test_uid=test_uid).first_or_404()
+    test = _get_test_by_uid(test_uid)
     if test.mode != ModeEnum.interactive:
         abort(404)
     if test.status != TestStatusEnum.completed:
@@ -356,7 +377,10 @@ def review_by_uid(test_uid):
     # reuse loader
     test, tq, q, resp = _load_review_n(test.id, n)
     if not q:
-        return redirect(url_for("student.review_by_uid", test_uid=test_uid, q=1))
+        first = _first_sequence(test.id)
+        if first is None:
+            abort(404)
+        return redirect(url_for("student.review_by_uid", test_uid=test_uid, q=first))
 
     has_prev = n > 1
     has_next = n < test.total_questions
@@ -372,24 +396,31 @@ def review_by_uid(test_uid):
         totals=totals
     )
 
+# The summary page walks every TestQuestion and TestResponse of the test, so load
+# both collections up front. (They stay lazy on the relationships themselves:
+# the per-question runner and submit API load a Test without touching them.)
+SUMMARY_LOAD_OPTIONS = (selectinload(Test.questions), selectinload(Test.responses))
+
 @student_bp.route("/summary/<int:test_id>", methods=["GET"])
 def summary(test_id):
-    test = Test.query.get_or_404(test_id)
+    test = db.get_or_404(Test, test_id, options=SUMMARY_LOAD_OPTIONS)
     if test.status != TestStatusEnum.completed:
         return redirect(url_for("student.test_page", test_id=test.id, q=1))
     # build summary
     # If you added get_summary():
     totals = get_summary(test.id)
     # else, compute here (correct/incorrect/unanswered)
-    return render_template("student/review_summary.html", test=test, totals=totals)
+    responses_by_qid = {r.question_id: r for r in test.responses}
+    return render_template("student/review_summary.html", test=test, totals=totals, responses_by_qid=responses_by_qid)
 
 # Optional public summary for interactive tests by UID
 @student_bp.route("/summary-by-uid/<string:test_uid>", methods=["GET"])
 def summary_by_uid(test_uid):
-    test = Test.query.filter_by(test_uid=test_uid).first_or_404()
+    test = _get_test_by_uid(test_uid, *SUMMARY_LOAD_OPTIONS)
     if test.mode != ModeEnum.interactive:
         abort(404)
     if test.status != TestStatusEnum.completed:
         return redirect(url_for("student.test_page", test_id=test.id, q=1))
     totals = get_summary(test.id)
-    return render_template("student/review_summary.html", test=test, totals=totals, public_uid_view=True)
\ No newline at end of file
+    responses_by_qid = {r.question_id: r for r in test.responses}
+    return render_template("student/review_summary.html", test=test, totals=totals, responses_by_qid=responses_by_qid, public_uid_view=True)
\ No newline at end of file
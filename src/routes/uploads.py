@@ -1,10 +1,43 @@
 # routes/uploads.py
-from flask import Blueprint, current_app, send_from_directory
+import mimetypes
+import os
+from urllib.parse import quote
+
+from flask import Blueprint, Response, abort, current_app, send_from_directory
 from pathlib import Path
+from werkzeug.security import safe_join
 
 uploads_bp = Blueprint("uploads", __name__)
 
+
+@uploads_bp.record_once
+def _resolve_upload_base(state):
+    """Resolve UPLOAD_DIR once when the blueprint is registered, not per request."""
+    state.app.extensions["upload_base"] = Path(state.app.config["UPLOAD_DIR"]).resolve()
+
+
 @uploads_bp.route("/uploads/<path:relpath>")
 def serve_upload(relpath):
-    base_dir = Path(current_app.config["UPLOAD_DIR"]).resolve()
-    return send_from_directory(base_dir, relpath)
+    base_dir = current_app.extensions["upload_base"]
+    # Uploaded files get fresh random names, so a URL's content never changes
+    max_age = current_app.config["UPLOAD_MAX_AGE"]
+
+    # Behind nginx: hand the transfer to it via an internal location
+    # (see README) instead of streaming the file through this worker
+    accel_prefix = current_app.config.get("UPLOADS_ACCEL_REDIRECT")
+    if accel_prefix:
+        path = safe_join(str(base_dir), relpath)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        rel = Path(path).relative_to(base_dir).as_posix()
+        resp = Response(mimetype=mimetypes.guess_type(path)[0] or "application/octet-stream")
+        resp.headers["X-Accel-Redirect"] = f"{accel_prefix.rstrip('/')}/{quote(rel)}"
+        resp.cache_control.public = True
+        resp.cache_control.max_age = max_age
+        return resp
+
+    # With USE_X_SENDFILE (Apache mod_xsendfile, lighttpd) Flask sends an
+    # X-Sendfile header here instead of the file body
+    resp = send_from_directory(base_dir, relpath, max_age=max_age, conditional=True)
+    resp.cache_control.public = True
+    return resp
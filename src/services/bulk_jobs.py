@@ -0,0 +1,86 @@
+# Background runner for admin bulk imports
+# services/bulk_jobs.py
+"""
+Bulk imports run on a small per-process thread pool, so the upload request only
+stages the files and returns. Progress and results live on the BulkJob row, so
+any worker can report them; a job that was running when its process died stays
+"running" and has to be re-uploaded.
+"""
+from __future__ import annotations
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+from flask import current_app
+from sqlalchemy import func
+
+from extensions import db
+from models import BulkJob, BulkJobStatusEnum
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=current_app.config["BULK_IMPORT_WORKERS"],
+            thread_name_prefix="bulk-import",
+        )
+    return _executor
+
+
+def submit_bulk_job(job_id: int, work_dir: str, fn: Callable[..., Tuple[int, List[str]]], *args) -> None:
+    """
+    Run fn(*args) -> (created, errors) for BulkJob `job_id` in the background,
+    inside an app context. `work_dir` (the staged upload) is removed afterwards.
+    """
+    app = current_app._get_current_object()
+    _get_executor().submit(_run_job, app, job_id, work_dir, fn, args)
+
+
+def _run_job(app, job_id: int, work_dir: str, fn, args) -> None:
+    # Runs on an executor thread whose Future nobody waits on: every failure has to
+    # end up logged and on the job row, or the polling page spins forever.
+    with app.app_context():
+        try:
+            _set_status(job_id, BulkJobStatusEnum.running)
+            try:
+                created, errors = fn(*args)
+                status = BulkJobStatusEnum.done
+            except Exception as e:
+                db.session.rollback()
+                app.logger.exception("Bulk import job %s failed", job_id)
+                created, errors = 0, [f"Import failed: {e}"]
+                status = BulkJobStatusEnum.failed
+            _finish(job_id, status, created, errors)
+        except Exception:
+            # The bookkeeping itself failed (lost connection, unserialisable errors, ...)
+            db.session.rollback()
+            app.logger.exception("Bulk import job %s: could not record its result", job_id)
+            try:
+                _finish(job_id, BulkJobStatusEnum.failed, 0,
+                        ["Import failed: the result could not be recorded. See the server log."])
+            except Exception:
+                db.session.rollback()
+                app.logger.exception("Bulk import job %s: could not mark it failed", job_id)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _set_status(job_id: int, status: BulkJobStatusEnum) -> None:
+    db.session.query(BulkJob).filter(BulkJob.id == job_id).update({"status": status})
+    db.session.commit()
+
+
+def _finish(job_id: int, status: BulkJobStatusEnum, created: int, errors: List[str]) -> None:
+    job = db.session.get(BulkJob, job_id)
+    if job is None:
+        current_app.logger.warning("Bulk import job %s was deleted before it finished", job_id)
+        return
+    job.status = status
+    job.created_count = created
+    job.failed_count = len(errors)
+    job.errors = errors
+    job.finished_at = func.now()
+    db.session.commit()
@@ -2,10 +2,10 @@
 # services/test_service.py
 from __future__ import annotations
 from datetime import datetime, timezone
-from sqlalchemy import func
+from sqlalchemy import case, func, update
 from extensions import db
 from models import (
-    Test, TestQuestion, TestResponse, Question,
+    Test, TestResponse, Question,
     ModeEnum, TimerModeEnum, TestStatusEnum
 )
 
@@ -15,7 +15,7 @@ def compute_and_finalize_test(test_id: int) -> dict:
     Returns { total: int, correct: int, incorrect: int, unanswered: int }
     Idempotent: safe to call multiple times.
     """
-    test = Test.query.get_or_404(test_id)
+    test = db.get_or_404(Test, test_id)
 
     if test.status == TestStatusEnum.completed:
         # already finalized → recompute summary from current responses
@@ -30,52 +30,49 @@ def compute_and_finalize_test(test_id: int) -> dict:
             # finishing early is fine; no block
             pass
 
-    # Build lookups
-    tqs = (
-        TestQuestion.query
-        .filter_by(test_id=test.id)
-        .order_by(TestQuestion.sequence.asc())
-        .all()
-    )
-    qids = [tq.question_id for tq in tqs]
-
-    # Responses by question_id
-    resps = (
-        TestResponse.query
-        .filter(TestResponse.test_id == test.id, TestResponse.question_id.in_(qids))
-        .all()
-    )
-    resp_map = {r.question_id: r for r in resps}
+    # Counted before finalizing: the stats UPDATE doesn't change them, and the
+    # summary below is built from them (no re-query once the commit expires test)
+    total = test.total_questions
+    answered, correct = _summary_counts(test.id)
 
-    # Update stats on each answered question
-    for qid in qids:
-        q = Question.query.get(qid)
-        if not q:
-            continue
-        # Total attempts increments if there's a response
-        if qid in resp_map:
-            q.total_attempts = (q.total_attempts or 0) + 1
-            if resp_map[qid].is_correct:
-                q.correct_count = (q.correct_count or 0) + 1
+    # Bump per-question stats for every answered question in one multi-table
+    # UPDATE (MySQL: UPDATE questions, test_responses ... WHERE). Responses only
+    # exist for questions in this test, at most one per question. Abandoned tests
+    # with no answers skip it.
+    if answered:
+        db.session.execute(
+            update(Question)
+            .where(
+                Question.id == TestResponse.question_id,
+                TestResponse.test_id == test.id,
+            )
+            .values(
+                total_attempts=Question.total_attempts + 1,
+                correct_count=Question.correct_count + case((TestResponse.is_correct, 1), else_=0),
+            )
+            .execution_options(synchronize_session=False)
+        )
 
     # Mark test completed
     test.status = TestStatusEnum.completed
     db.session.commit()
 
-    return _summary_for(test)
+    return _summary_dict(total, answered, correct)
 
-def _summary_for(test: Test) -> dict:
-    total = test.total_questions
-    answered = (
-        TestResponse.query
-        .filter_by(test_id=test.id)
-        .count()
-    )
-    correct = (
-        TestResponse.query
-        .filter_by(test_id=test.id, is_correct=True)
-        .count()
+def _summary_counts(test_id: int) -> tuple[int, int]:
+    """(answered, correct) for a test, from one conditional-aggregate query."""
+    answered, correct = (
+        db.session.query(
+            func.count(TestResponse.id),
+            func.sum(case((TestResponse.is_correct, 1), else_=0)),
+        )
+        .filter(TestResponse.test_id == test_id)
+        .one()
     )
+    # SUM() over zero rows is NULL
+    return answered, int(correct or 0)
+
+def _summary_dict(total: int, answered: int, correct: int) -> dict:
     return {
         "total": total,
         "correct": correct,
@@ -83,28 +80,12 @@ def _summary_for(test: Test) -> dict:
         "unanswered": total - answered,
     }
 
+def _summary_for(test: Test) -> dict:
+    return _summary_dict(test.total_questions, *_summary_counts(test.id))
+
 def get_summary(test_id: int) -> dict:
     """
     Convenience wrapper: return summary dict for a test.
     { total, correct, incorrect, unanswered }
     """
-    from models import Test  # local import to avoid circulars
-    test = Test.query.get_or_404(test_id)
-
-    total = test.total_questions
-    answered = (
-        TestResponse.query
-        .filter_by(test_id=test.id)
-        .count()
-    )
-    correct = (
-        TestResponse.query
-        .filter_by(test_id=test.id, is_correct=True)
-        .count()
-    )
-    return {
-        "total": total,
-        "correct": correct,
-        "incorrect": answered - correct,
-        "unanswered": total - answered,
-    }
+    return _summary_for(db.get_or_404(Test, test_id))
@@ -0,0 +1,41 @@
+import os
+import tempfile
+
+# Point the app at a throwaway database and directories before `config` is
+# imported (it reads the environment once). Set TEST_DB_URL to run against a
+# real MySQL/MariaDB test database instead of in-memory SQLite.
+_TMP = tempfile.mkdtemp(prefix="mcq-tests-")
+os.environ["DB_URL"] = os.environ.get("TEST_DB_URL", "sqlite://")
+os.environ["SESSION_TYPE"] = "cookie"
+os.environ["UPLOAD_DIR"] = os.path.join(_TMP, "uploads")
+os.environ["ADMIN_SECRET_FILE"] = os.path.join(_TMP, "config", "admin_secret.txt")
+
+import pytest
+
+from app import create_app
+from extensions import db
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def admin_client(client):
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+    return client
@@ -0,0 +1,122 @@
+from contextlib import contextmanager
+
+import pytest
+from flask import template_rendered
+
+from extensions import db
+from models import Question, Subject
+from routes.admin import QUESTIONS_PER_PAGE
+
+
+@contextmanager
+def captured_context(app):
+    """Collect the context of every template `app` renders."""
+    contexts = []
+
+    def record(sender, template, context, **extra):
+        contexts.append(context)
+
+    template_rendered.connect(record, app)
+    try:
+        yield contexts
+    finally:
+        template_rendered.disconnect(record, app)
+
+
+def _seed(app, count, subject_name="Physics"):
+    """Add `count` questions to a new subject; ids run upwards in insert order."""
+    with app.app_context():
+        subject = Subject(name=subject_name)
+        db.session.add(subject)
+        db.session.flush()
+        db.session.add_all(
+            Question(
+                subject_id=subject.id,
+                question_text=f"Question {n}",
+                option_a="a", option_b="b", option_c="c", option_d="d",
+                correct_option="A",
+            )
+            for n in range(count)
+        )
+        db.session.commit()
+        return subject.id
+
+
+def _page(app, client, **args):
+    with captured_context(app) as contexts:
+        rv = client.get("/admin/questions", query_string=args)
+    assert rv.status_code == 200
+    ctx, = contexts
+    return [row.id for row in ctx["questions"]], ctx["pagination"]
+
+
+def test_questions_first_page_is_newest(app, admin_client):
+    _seed(app, 60)
+    ids, pagination = _page(app, admin_client)
+    assert QUESTIONS_PER_PAGE == 25
+    assert ids == list(range(60, 35, -1))
+    assert pagination == {"has_prev": False, "has_next": True, "prev_after_id": 60, "next_before_id": 36}
+
+
+def test_questions_before_id_pages_to_older(app, admin_client):
+    _seed(app, 60)
+    ids, pagination = _page(app, admin_client, before_id=36)
+    assert ids == list(range(35, 10, -1))
+    assert pagination == {"has_prev": True, "has_next": True, "prev_after_id": 35, "next_before_id": 11}
+
+    ids, pagination = _page(app, admin_client, before_id=11)
+    assert ids == list(range(10, 0, -1))
+    assert (pagination["has_prev"], pagination["has_next"]) == (True, False)
+
+
+def test_questions_after_id_pages_back_to_newer(app, admin_client):
+    _seed(app, 60)
+    ids, pagination = _page(app, admin_client, after_id=10)
+    assert ids == list(range(35, 10, -1))  # still newest first
+    assert (pagination["has_prev"], pagination["has_next"]) == (True, True)
+
+    ids, pagination = _page(app, admin_client, after_id=35)
+    assert ids == list(range(60, 35, -1))
+    assert (pagination["has_prev"], pagination["has_next"]) == (False, True)
+
+    # A partial newer page still shows the newest questions
+    ids, pagination = _page(app, admin_client, after_id=50)
+    assert ids == list(range(60, 50, -1))
+    assert (pagination["has_prev"], pagination["has_next"]) == (False, True)
+
+
+def test_questions_exactly_one_full_page(app, admin_client):
+    _seed(app, QUESTIONS_PER_PAGE)
+    ids, pagination = _page(app, admin_client)
+    assert len(ids) == QUESTIONS_PER_PAGE
+    assert (pagination["has_prev"], pagination["has_next"]) == (False, False)
+
+
+def test_questions_last_page_of_exact_multiple(app, admin_client):
+    _seed(app, 2 * QUESTIONS_PER_PAGE)
+    ids, pagination = _page(app, admin_client, before_id=26)
+    assert ids == list(range(25, 0, -1))
+    assert (pagination["has_prev"], pagination["has_next"]) == (True, False)
+
+
+@pytest.mark.parametrize("count, args", [(0, {}), (60, {"before_id": 1}), (60, {"after_id": 60})])
+def test_questions_empty_page(app, admin_client, count, args):
+    _seed(app, count)
+    ids, pagination = _page(app, admin_client, **args)
+    assert ids == []
+    assert pagination == {"has_prev": False, "has_next": False, "prev_after_id": None, "next_before_id": None}
+
+
+def test_questions_subject_filter_pages_within_subject(app, admin_client):
+    physics = _seed(app, 30, "Physics")
+    chemistry = _seed(app, 30, "Chemistry")  # ids 31..60
+    ids, pagination = _page(app, admin_client, subject_id=physics)
+    assert ids == list(range(30, 5, -1))
+    assert pagination["has_next"] is True
+
+    ids, pagination = _page(app, admin_client, subject_id=physics, before_id=6)
+    assert ids == list(range(5, 0, -1))
+    assert pagination["has_next"] is False
+
+    ids, _ = _page(app, admin_client, subject_id=chemistry, after_id=35)
+    assert ids == list(range(60, 35, -1))
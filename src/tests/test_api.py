@@ -0,0 +1,80 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import mysql
+
+from extensions import db
+import models
+from models import ModeEnum, Question, Subject
+from routes.api import _upsert_response_stmt
+
+
+@contextmanager
+def count_writes():
+    """Count INSERT/UPDATE/DELETE statements sent to the database."""
+    writes = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().split(None, 1)[0].upper() in ("INSERT", "UPDATE", "DELETE"):
+            writes.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield writes
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def answered(app):
+    """An active interactive test whose only question already has answer 'B' saved."""
+    with app.app_context():
+        subject = Subject(name="Physics")
+        question = Question(
+            subject=subject, question_text="Q", option_a="a", option_b="b", option_c="c", option_d="d",
+            correct_option="C",
+        )
+        test = models.Test(subject=subject, mode=ModeEnum.interactive, total_questions=1)
+        db.session.add_all([
+            test,
+            models.TestQuestion(test=test, question=question, sequence=1),
+            models.TestResponse(test=test, question=question, selected_option="B", correct_option="C"),
+        ])
+        db.session.commit()
+        return test.id, question.id
+
+
+def _submit(client, test_id, question_id, option):
+    return client.post(f"/api/test/{test_id}/submit", json={"question_id": question_id, "selected_option": option})
+
+
+def test_upsert_compiles_to_on_duplicate_key_update(app):
+    with app.app_context():
+        stmt = _upsert_response_stmt(test_id=1, question_id=2, selected_option="A", correct_option="B")
+        sql = str(stmt.compile(dialect=mysql.dialect()))
+    assert sql.startswith("INSERT INTO test_responses")
+    update = sql.split("ON DUPLICATE KEY UPDATE", 1)[1]
+    assert "selected_option" in update and "correct_option" in update
+    assert "test_id" not in update and "question_id" not in update
+
+
+def test_resubmitting_saved_answer_does_not_write(app, client, answered):
+    test_id, question_id = answered
+    with app.app_context(), count_writes() as writes:
+        rv = _submit(client, test_id, question_id, "b")
+    assert rv.status_code == 200
+    assert rv.get_json() == {"ok": True, "is_correct": False, "question_seq": 1}
+    assert writes == []
+
+
+def test_changed_answer_is_upserted(app, client, answered):
+    with app.app_context():
+        if db.engine.dialect.name not in ("mysql", "mariadb"):
+            pytest.skip("ON DUPLICATE KEY UPDATE needs MySQL/MariaDB (set TEST_DB_URL)")
+    test_id, question_id = answered
+    rv = _submit(client, test_id, question_id, "C")
+    assert rv.get_json()["is_correct"] is True
+    with app.app_context():
+        response, = db.session.query(models.TestResponse).all()
+        assert (response.selected_option, response.is_correct) == ("C", True)
@@ -1,13 +1,59 @@
 import pytest
-from app import create_app
-
-@pytest.fixture
-def client():
-    app = create_app()
-    app.config['TESTING'] = True
-    with app.test_client() as client:
-        yield client
 
 def test_home(client):
     rv = client.get('/')
     assert rv.status_code == 200
+
+@pytest.fixture
+def login_client(client, tmp_path):
+    app = client.application
+    app.config["ADMIN_SECRET_FILE"] = str(tmp_path / "admin_secret.txt")
+    return client
+
+def test_login_rejects_password_over_72_bytes(login_client):
+    import bcrypt
+    secret = login_client.application.config["ADMIN_SECRET_FILE"]
+    with open(secret, "wb") as f:
+        f.write(bcrypt.hashpw(b"correct-password", bcrypt.gensalt(rounds=4)))
+    rv = login_client.post("/admin/login", data={"password": "x" * 100})
+    assert rv.status_code == 200
+    assert b"Invalid password." in rv.data
+
+def test_login_without_admin_password_looks_like_wrong_password(login_client):
+    rv = login_client.post("/admin/login", data={"password": "whatever"})
+    assert rv.status_code == 200
+    assert b"Invalid password." in rv.data
+    assert b"not set" not in rv.data
+
+def _post_raw_content_type(client, content_type):
+    # The test client rewrites multipart Content-Types with its own boundary;
+    # set the WSGI variable directly so the guard sees exactly this header.
+    return client.post("/api/heartbeat", data=b"", environ_overrides={"CONTENT_TYPE": content_type})
+
+@pytest.mark.parametrize("content_type", [
+    "multipart/form-data; boundary=----WebKitFormBoundary7MA4YWxkTrZu0gW",            # Chrome / Safari
+    "multipart/form-data; boundary=---------------------------974767299852498929531610575",  # Firefox
+    "multipart/form-data; boundary=------------------------d74496d66958873e",         # curl
+    'multipart/form-data; boundary="quoted boundary:with/punct.="',
+    "Multipart/Form-Data; charset=utf-8; boundary=abc",
+    "multipart/form-data; boundary=" + "a" * 128,
+    "application/json",
+    "",
+])
+def test_multipart_guard_accepts_well_formed_content_types(client, content_type):
+    rv = _post_raw_content_type(client, content_type)
+    assert rv.status_code == 200
+
+@pytest.mark.parametrize("content_type", [
+    "multipart/form-data",
+    "multipart/form-data; charset=utf-8",
+    "multipart/form-data; boundary=",
+    "multipart/form-data; boundary=" + "a" * 129,
+    "multipart/form-data; boundary=abc<def",
+    "multipart/form-data; boundary=abc def",
+    'multipart/form-data; boundary="unterminated',
+    "multipart/form-data; a=1; b=2; c=3; boundary=abc",
+])
+def test_multipart_guard_rejects_malformed_content_types(client, content_type):
+    rv = _post_raw_content_type(client, content_type)
+    assert rv.status_code == 400
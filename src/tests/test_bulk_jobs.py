@@ -0,0 +1,155 @@
+import io
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import routes.admin as admin_routes
+from extensions import db
+from models import BulkJob, BulkJobStatusEnum, Question, Subject
+from services import bulk_jobs
+
+CSV_HEADER = "subject,question_text,option_a,option_b,option_c,option_d,correct_option\n"
+
+
+class _SyncExecutor:
+    """Stands in for the ThreadPoolExecutor: runs the job inline."""
+
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+@pytest.fixture
+def sync_executor(monkeypatch):
+    monkeypatch.setattr(bulk_jobs, "_executor", _SyncExecutor())
+
+
+@pytest.fixture
+def captured_jobs(monkeypatch):
+    """Record submit_bulk_job calls from the upload route instead of running them."""
+    calls = []
+    monkeypatch.setattr(admin_routes, "submit_bulk_job", lambda *args: calls.append(args))
+    return calls
+
+
+def _upload(client, csv_text):
+    data = {"csv_file": (io.BytesIO(csv_text.encode("utf-8")), "questions.csv")}
+    return client.post("/admin/bulk-upload", data=data, content_type="multipart/form-data")
+
+
+def _new_job(app, **values):
+    with app.app_context():
+        job = BulkJob(**values)
+        db.session.add(job)
+        db.session.commit()
+        return job.id
+
+
+def test_bulk_upload_stages_files_and_queues_job(app, admin_client, captured_jobs):
+    rv = _upload(admin_client, CSV_HEADER + "Physics,Q1,a,b,c,d,A\n")
+    assert rv.status_code == 302
+
+    (job_id, work_dir, fn, csv_path, zip_path), = captured_jobs
+    assert rv.headers["Location"].endswith(f"/admin/bulk-upload/{job_id}")
+    assert Path(work_dir).parent == Path(tempfile.gettempdir())
+    assert Path(csv_path) == Path(work_dir) / "questions.csv"
+    assert Path(csv_path).read_text(encoding="utf-8").startswith(CSV_HEADER)
+    assert zip_path is None
+    assert fn is admin_routes._import_rows
+    with app.app_context():
+        assert db.session.get(BulkJob, job_id).status == BulkJobStatusEnum.queued
+    shutil.rmtree(work_dir)
+
+
+def test_bulk_upload_rejects_bad_header(app, admin_client, captured_jobs):
+    rv = _upload(admin_client, "subject,question_text\nPhysics,Q1\n")
+    assert rv.status_code == 400
+    assert b"CSV missing required column: option_a" in rv.data
+    assert captured_jobs == []
+    with app.app_context():
+        assert db.session.query(BulkJob).count() == 0
+
+
+def test_check_csv_header(tmp_path):
+    good = tmp_path / "good.csv"
+    good.write_text("\ufeff" + CSV_HEADER.upper(), encoding="utf-8")
+    assert admin_routes._check_csv_header(str(good)) == []
+
+    bad = tmp_path / "bad.csv"
+    bad.write_text("subject,option_a\n", encoding="utf-8")
+    assert admin_routes._check_csv_header(str(bad)) == [
+        "CSV missing required column: question_text",
+        "CSV missing required column: option_b",
+        "CSV missing required column: option_c",
+        "CSV missing required column: option_d",
+        "CSV missing required column: correct_option",
+    ]
+
+
+def test_bulk_job_status_payload(app, admin_client):
+    job_id = _new_job(app, status=BulkJobStatusEnum.done, created_count=3, failed_count=1, errors=["Row 2: x"])
+    rv = admin_client.get(f"/admin/bulk-upload/{job_id}/status")
+    assert rv.status_code == 200
+    assert rv.get_json() == {"id": job_id, "status": "done", "finished": True, "created": 3, "failed": 1}
+
+    assert admin_client.get("/admin/bulk-upload/999/status").status_code == 404
+
+
+def test_run_job_records_counts_and_removes_work_dir(app, sync_executor):
+    with app.app_context():
+        db.session.add(Subject(name="Physics"))
+        db.session.commit()
+    job_id = _new_job(app)
+    work_dir = tempfile.mkdtemp(prefix="bulk-upload-")
+    csv_path = os.path.join(work_dir, "questions.csv")
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.write(CSV_HEADER + "Physics,Q1,a,b,c,d,A\nPhysics,Q2,a,b,c,d,Z\nNope,Q3,a,b,c,d,B\n")
+
+    with app.test_request_context():
+        bulk_jobs.submit_bulk_job(job_id, work_dir, admin_routes._import_rows, csv_path, None)
+
+    assert not os.path.exists(work_dir)
+    with app.app_context():
+        job = db.session.get(BulkJob, job_id)
+        assert job.status == BulkJobStatusEnum.done
+        assert (job.created_count, job.failed_count) == (1, 2)
+        assert job.errors == [
+            "Row 3: correct_option must be one of A, B, C, D",
+            "Row 4: Subject 'Nope' not found. Create it first.",
+        ]
+        assert job.finished_at is not None
+        assert db.session.query(Question).count() == 1
+
+
+def test_run_job_marks_failed_when_import_raises(app, sync_executor):
+    job_id = _new_job(app)
+    work_dir = tempfile.mkdtemp(prefix="bulk-upload-")
+
+    def boom():
+        raise RuntimeError("disk on fire")
+
+    with app.app_context():
+        bulk_jobs.submit_bulk_job(job_id, work_dir, boom)
+
+    assert not os.path.exists(work_dir)
+    with app.app_context():
+        job = db.session.get(BulkJob, job_id)
+        assert job.status == BulkJobStatusEnum.failed
+        assert job.errors == ["Import failed: disk on fire"]
+
+
+def test_run_job_marks_failed_when_result_cannot_be_saved(app, sync_executor):
+    job_id = _new_job(app)
+    work_dir = tempfile.mkdtemp(prefix="bulk-upload-")
+
+    with app.app_context():
+        # errors must be JSON-serialisable; recording this result fails at commit
+        bulk_jobs.submit_bulk_job(job_id, work_dir, lambda: (0, [object()]))
+
+    assert not os.path.exists(work_dir)
+    with app.app_context():
+        job = db.session.get(BulkJob, job_id)
+        assert job.status == BulkJobStatusEnum.failed
+        assert job.failed_count == 1
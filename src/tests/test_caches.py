@@ -0,0 +1,122 @@
+from types import SimpleNamespace
+
+import pytest
+
+import caches
+from caches import SubjectRow, subject_cache
+from extensions import db
+from models import Question, Subject
+
+
+def _session(new=(), dirty=(), deleted=()):
+    """Just the attributes the cache listeners look at."""
+    return SimpleNamespace(new=list(new), dirty=list(dirty), deleted=list(deleted), info={})
+
+
+@pytest.fixture
+def ctx(app):
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(caches.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _add_subject(name):
+    db.session.add(Subject(name=name))
+    db.session.commit()
+
+
+# ---------- Listeners (mocked session) ----------
+
+@pytest.mark.parametrize("part", ["new", "dirty", "deleted"])
+def test_before_flush_marks_subject_writes(part):
+    session = _session(**{part: [Subject(name="Physics")]})
+    caches._note_subject_writes(session, None, None)
+    assert session.info == {caches._SUBJECTS_DIRTY: True}
+
+
+def test_before_flush_ignores_other_writes():
+    session = _session(new=[Question(question_text="Q")])
+    caches._note_subject_writes(session, None, None)
+    assert session.info == {}
+
+
+def test_after_commit_drops_cache_only_when_marked(ctx):
+    ctx.extensions[subject_cache.key] = ([], {}, 0.0)
+    session = _session()
+
+    caches._invalidate_subject_cache(session)
+    assert subject_cache.key in ctx.extensions
+
+    session.info[caches._SUBJECTS_DIRTY] = True
+    caches._invalidate_subject_cache(session)
+    assert subject_cache.key not in ctx.extensions
+    assert session.info == {}
+
+
+def test_after_rollback_clears_mark_and_keeps_cache(ctx):
+    snap = ([], {}, 0.0)
+    ctx.extensions[subject_cache.key] = snap
+    session = _session()
+    session.info[caches._SUBJECTS_DIRTY] = True
+
+    caches._forget_subject_writes(session)
+    assert session.info == {}
+    assert ctx.extensions[subject_cache.key] is snap
+
+
+def test_invalidate_outside_app_context_is_a_no_op():
+    subject_cache.invalidate()
+
+
+# ---------- SubjectCache (real session) ----------
+
+def test_cache_serves_snapshot_until_ttl(ctx, clock):
+    ctx.config["SUBJECT_CACHE_TTL"] = 60
+    _add_subject("Physics")
+    assert subject_cache.all() == [SubjectRow(1, "Physics")]
+
+    # Written behind the ORM's back, so no listener fires
+    db.session.execute(Subject.__table__.insert().values(name="Chemistry"))
+    db.session.commit()
+    clock[0] += 60
+    assert subject_cache.names() == {1: "Physics"}
+
+    clock[0] += 1
+    assert subject_cache.names() == {1: "Physics", 2: "Chemistry"}
+    assert [r.name for r in subject_cache.choices()] == ["Chemistry", "Physics"]
+    assert subject_cache.get(2) == SubjectRow(2, "Chemistry")
+    assert subject_cache.get(99) is None
+
+
+def test_committed_subject_write_refreshes_cache(ctx, clock):
+    _add_subject("Physics")
+    assert [r.name for r in subject_cache.all()] == ["Physics"]
+
+    _add_subject("Biology")
+    assert subject_cache.key not in ctx.extensions
+    assert [r.name for r in subject_cache.all()] == ["Biology", "Physics"]
+
+    db.session.get(Subject, 1).name = "Applied Physics"
+    db.session.commit()
+    assert subject_cache.get(1).name == "Applied Physics"
+
+
+def test_rolled_back_subject_write_keeps_cache(ctx, clock):
+    _add_subject("Physics")
+    subject_cache.all()
+    snap = ctx.extensions[subject_cache.key]
+
+    db.session.add(Subject(name="Biology"))
+    db.session.flush()
+    assert db.session.info[caches._SUBJECTS_DIRTY] is True
+    db.session.rollback()
+
+    assert caches._SUBJECTS_DIRTY not in db.session.info
+    assert ctx.extensions[subject_cache.key] is snap
+    assert [r.name for r in subject_cache.all()] == ["Physics"]
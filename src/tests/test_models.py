@@ -0,0 +1,76 @@
+import time
+import uuid
+
+import pytest
+from sqlalchemy.dialects import mysql, sqlite
+
+import models
+from models import OptionLetter, new_test_uid
+
+DIALECTS = [mysql.dialect(), sqlite.dialect()]
+
+
+@pytest.mark.parametrize("dialect", DIALECTS, ids=lambda d: d.name)
+def test_option_letter_round_trip(dialect):
+    t = OptionLetter()
+    stored = [t.process_bind_param(letter, dialect) for letter in "ABCD"]
+    assert stored == [0, 1, 2, 3]
+    assert [t.process_result_value(v, dialect) for v in stored] == ["A", "B", "C", "D"]
+
+
+@pytest.mark.parametrize("value", ["E", "a", "", "AB"])
+def test_option_letter_rejects_other_values(value):
+    with pytest.raises(ValueError):
+        OptionLetter().process_bind_param(value, mysql.dialect())
+
+
+def test_option_letter_rejects_out_of_range_stored_value():
+    with pytest.raises(IndexError):
+        OptionLetter().process_result_value(4, mysql.dialect())
+
+
+def test_option_letter_passes_none_through():
+    t = OptionLetter()
+    assert t.process_bind_param(None, mysql.dialect()) is None
+    assert t.process_result_value(None, mysql.dialect()) is None
+
+
+def test_option_letter_column_types():
+    t = OptionLetter()
+    assert str(t.load_dialect_impl(mysql.dialect()).compile(dialect=mysql.dialect())) == "TINYINT UNSIGNED"
+    assert t.load_dialect_impl(sqlite.dialect()).compile(dialect=sqlite.dialect()) == "SMALLINT"
+
+
+def test_new_test_uid_is_uuid7():
+    value = uuid.UUID(bytes=new_test_uid())
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+
+
+def test_test_uid_hex_round_trip():
+    raw = new_test_uid()
+    hex_uid = models.Test(test_uid=raw).test_uid_hex
+    assert hex_uid == raw.hex() and len(hex_uid) == 32
+    assert models.Test.uid_from_hex(hex_uid) == raw
+    assert models.Test.uid_from_hex(hex_uid.upper()) == raw
+    assert models.Test(test_uid=None).test_uid_hex is None
+
+
+@pytest.mark.parametrize("value", ["not-hex", "", "ab" * 15, "zz" * 16])
+def test_uid_from_hex_rejects_malformed(value):
+    assert models.Test.uid_from_hex(value) is None
+
+
+def test_new_test_uids_sort_in_generation_order():
+    uids = []
+    for _ in range(5):
+        uids.append(new_test_uid())
+        time.sleep(0.002)  # the timestamp prefix has millisecond resolution
+    assert sorted(uids) == uids
+    assert len(set(uids)) == len(uids)
+
+
+@pytest.mark.parametrize("path", ["/summary-by-uid", "/review-by-uid"])
+@pytest.mark.parametrize("test_uid", ["not-hex", "0" * 32])
+def test_by_uid_routes_404_on_malformed_or_unknown_uid(client, path, test_uid):
+    assert client.get(f"{path}/{test_uid}").status_code == 404